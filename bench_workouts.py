@@ -0,0 +1,240 @@
+"""
+Benchmark the workout page generator's hot paths on synthetic catalogs.
+Writes machine-readable JSON results and can compare them against a stored baseline.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import generate_workouts as gw
+
+EQUIPMENT_WORDS = ["Barbell", "Dumbbell", "Cable", "Machine", "Smith", "Band", "Plate", "TRX", "Kettlebell", ""]
+MOVEMENT_WORDS = ["Press", "Row", "Curl", "Raise", "Fly", "Squat", "Lunge", "Extension", "Pulldown", "Crunch"]
+MODIFIER_WORDS = ["Incline", "Decline", "Seated", "Standing", "Single-Arm", "Close-Grip", "Wide-Grip", "Paused", ""]
+
+# Metrics where a larger value is a regression; everything else is informational.
+COMPARED_SUFFIXES = ("_us", "_ms", "_s", "_peak_bytes")
+
+
+def synthetic_catalog(size: int, per_page: int = 50, seed: int = 0) -> list[gw.ExerciseGroup]:
+    """Groups like gw.catalog().groups, holding size exercises in total."""
+    rng = random.Random(seed)
+    groups = []
+    for start in range(0, size, per_page):
+        number = len(groups) + 1
+        names = []
+        for i in range(start, min(start + per_page, size)):
+            words = [rng.choice(MODIFIER_WORDS), rng.choice(EQUIPMENT_WORDS), rng.choice(MOVEMENT_WORDS)]
+            # Reuse names across pages the way real catalogs do, but keep most of them distinct.
+            suffix = f" {i % (size // 4 + 1)}" if rng.random() < 0.8 else ""
+            names.append(" ".join(word for word in words if word) + suffix)
+        groups.append(
+            gw.ExerciseGroup(
+                f"group-{number:05d}.html",
+                f"Synthetic Group {number}",
+                (f"Synthetic benchmark group {number}.", "Generated for generator benchmarks."),
+                rng.choice(["Pectoralis major", "Deltoids", "Lats and upper back", "Quadriceps"]),
+                rng.choice(["Triceps", "Core", "Forearms, grip", "Glutes, hamstrings"]),
+                tuple(names),
+            )
+        )
+    return groups
+
+
+def synthetic_specs(groups: list[gw.ExerciseGroup]) -> list[dict]:
+    return [gw.group_spec(group) for group in groups]
+
+
+def catalog_toml(groups: list[gw.ExerciseGroup]) -> str:
+    """A catalog source file holding groups, with empty legs and abs pages."""
+    lines = []
+    for group in groups:
+        lines += ["[[groups]]", f"filename = {json.dumps(group.filename)}", f"title = {json.dumps(group.title)}"]
+        lines.append(f"intro = {json.dumps(list(group.intro), ensure_ascii=False)}")
+        lines.append(f"default_primary = {json.dumps(group.default_primary)}")
+        lines.append(f"default_secondary = {json.dumps(group.default_secondary)}")
+        lines += ["exercises = ["] + [f"  {json.dumps(name, ensure_ascii=False)}," for name in group.exercises] + ["]", ""]
+    lines += ["[legs]", "intro = []", "sections = []", "", "[abs]", "intro = []", 'primary = ""', 'secondary = ""']
+    lines.append("exercises = []")
+    return "\n".join(lines) + "\n"
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def peak_memory(fn) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def reset_caches() -> None:
+    gw.CARD_CACHE = gw.CardCache()
+    gw.EQUIPMENT_MATCHER.infer.cache_clear()
+
+
+def directory_bytes(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def run_build(specs: list[dict], out_dir: str, jobs: int) -> None:
+    """Run gw.main() over the synthetic pages inside out_dir."""
+    original_specs, cwd = gw.page_specs, os.getcwd()
+    gw.page_specs = lambda: specs
+    os.chdir(out_dir)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            gw.main(["--force", "--jobs", str(jobs)])
+    finally:
+        os.chdir(cwd)
+        gw.page_specs = original_specs
+
+
+def bench_catalog(size: int, jobs: int, repeat: int) -> dict:
+    groups = synthetic_catalog(size)
+    specs = synthetic_specs(groups)
+    cards = [
+        (name, group.default_primary, group.default_secondary, gw.equip_infer(name))
+        for group in groups
+        for name in group.exercises
+    ]
+    names = [card[0] for card in cards]
+    results = {"exercises": size, "pages": len(specs)}
+
+    def render_cards():
+        for card in cards:
+            gw.card_html(*card)
+
+    results["card_html_us"] = best_of(render_cards, repeat) / len(cards) * 1e6
+
+    def infer_cold():
+        gw.EQUIPMENT_MATCHER.infer.cache_clear()
+        for name in names:
+            gw.equip_infer(name)
+
+    def infer_warm():
+        for name in names:
+            gw.equip_infer(name)
+
+    results["equip_infer_cold_us"] = best_of(infer_cold, repeat) / len(names) * 1e6
+    results["equip_infer_warm_us"] = best_of(infer_warm, repeat) / len(names) * 1e6
+
+    content = gw.page_html(groups[0].title, groups[0].intro, [])
+    results["wrap_page_us"] = best_of(lambda: [gw.wrap_page(content, "Benchmark") for _ in range(1000)], repeat) * 1e3
+
+    def render_pages():
+        reset_caches()
+        return [gw.render_spec(spec) for spec in specs]
+
+    results["page_render_ms"] = best_of(render_pages, repeat) / len(specs) * 1e3
+    results["page_render_peak_bytes"] = peak_memory(lambda: gw.render_spec(specs[0]))
+    results["page_output_bytes"] = sum(len(html.encode("utf-8")) for html in render_pages()) // len(specs)
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        source, cache = os.path.join(out_dir, "catalog.toml"), os.path.join(out_dir, "catalog-cache.bin")
+        with open(source, "w", encoding="utf-8") as f:
+            f.write(catalog_toml(groups))
+
+        def load_cold():
+            if os.path.exists(cache):
+                os.remove(cache)
+            gw.load_catalog(source, cache)
+
+        # Parse only, parse plus cache write, and a load served from the cache.
+        results["catalog_parse_ms"] = best_of(lambda: gw.load_catalog(source, None), repeat) * 1e3
+        results["catalog_cold_ms"] = best_of(load_cold, repeat) * 1e3
+        results["catalog_warm_ms"] = best_of(lambda: gw.load_catalog(source, cache), repeat) * 1e3
+        assert gw.load_catalog(source, cache).groups == tuple(groups)
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        reset_caches()
+        started = time.perf_counter()
+        run_build(specs, out_dir, jobs)
+        results["build_s"] = time.perf_counter() - started
+        results["build_output_bytes"] = directory_bytes(out_dir)
+    with tempfile.TemporaryDirectory() as out_dir:
+        reset_caches()
+        results["build_serial_peak_bytes"] = peak_memory(lambda: run_build(specs, out_dir, 1))
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Describe every compared metric that is more than threshold worse than the baseline."""
+    regressions = []
+    for size, metrics in results["catalogs"].items():
+        base = baseline.get("catalogs", {}).get(size, {})
+        for metric, value in metrics.items():
+            old = base.get(metric)
+            if not metric.endswith(COMPARED_SUFFIXES) or not old:
+                continue
+            change = value / old - 1
+            if change > threshold:
+                regressions.append(f"{size}: {metric} {old:.4g} -> {value:.4g} (+{change:.1%})")
+    return regressions
+
+
+def sizes_arg(value: str) -> list[int]:
+    return [int(part) for part in value.split(",") if part]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark generate_workouts.py on synthetic catalogs.")
+    parser.add_argument("--sizes", type=sizes_arg, default=[100, 10_000, 100_000], help="comma-separated exercise counts")
+    parser.add_argument("--jobs", type=gw.positive_int, default=os.cpu_count() or 1, help="--jobs passed to the build")
+    parser.add_argument("--repeat", type=gw.positive_int, default=3, help="timing repeats; the best run is kept")
+    parser.add_argument("--output", metavar="PATH", help="write results as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against results saved by an earlier --output")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown before failing (default 0.10)")
+    args = parser.parse_args(argv)
+
+    results = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "jobs": args.jobs,
+        "catalogs": {},
+    }
+    for size in args.sizes:
+        metrics = bench_catalog(size, args.jobs, args.repeat)
+        results["catalogs"][str(size)] = metrics
+        print(f"{size} exercises / {metrics['pages']} pages")
+        for metric, value in metrics.items():
+            if metric not in ("exercises", "pages"):
+                print(f"  {metric:<26} {value:,.3f}" if isinstance(value, float) else f"  {metric:<26} {value:,}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"Regressions beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
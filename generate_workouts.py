@@ -1,40 +1,85 @@
 """
 Generate workout section HTML fragments for TheFitBhaskar.in.
 Creates the requested muscle pages with <main> content only.
+Needs Python 3.11+ for tomllib; on Python 3.10 install tomli (pip install tomli) instead.
 """
 
+import argparse
+import contextlib
+import cProfile
+import functools
+import glob
+import gzip
+import hashlib
+import json
+import marshal
+import multiprocessing
+import os
+import posixpath
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from html import escape
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import tomllib
+except ImportError:  # Python 3.10: pip install tomli
+    import tomli as tomllib
+
+
+# Ordered (keywords, equipment) rules; the first rule with a keyword found in
+# the lowercased exercise name wins.
+EQUIPMENT_RULES = [
+    (("smith",), "Smith machine"),
+    (("barbell",), "Barbell"),
+    (("dumbbell",), "Dumbbells"),
+    (("machine", "pec-deck", "hack squat"), "Machine"),
+    (("cable", "pulldown"), "Cable machine"),
+    (("band",), "Bands"),
+    (("trx", "suspension"), "Suspension trainer (TRX)"),
+    (("press-down",), "Cable machine"),
+    (("plate",), "Weight plate"),
+    (("farmer",), "Farmer's handles / dumbbells"),
+    (("walk", "plank", "push-up", "crunch", "mountain climber", "bridge"), "Bodyweight"),
+    (("wheel",), "Ab wheel"),
+    (("trap bar",), "Trap bar"),
+]
+DEFAULT_EQUIPMENT = "Bodyweight or listed equipment"
+
+
+class EquipmentMatcher:
+    """Rule table flattened once into priority-ordered keywords, with a bounded cache per name."""
+
+    def __init__(self, rules, default: str = DEFAULT_EQUIPMENT, cache_size: int = 4096):
+        self.rules = [(tuple(keywords), equipment) for keywords, equipment in rules]
+        self.default = default
+        self._keywords = tuple((keyword, equipment) for keywords, equipment in self.rules for keyword in keywords)
+        self.infer = functools.lru_cache(maxsize=cache_size)(self._infer)
+
+    def _infer(self, name: str) -> str:
+        n = name.lower()
+        for keyword, equipment in self._keywords:
+            if keyword in n:
+                return equipment
+        return self.default
+
+
+EQUIPMENT_MATCHER = EquipmentMatcher(EQUIPMENT_RULES)
 
 
 def equip_infer(name: str) -> str:
-    n = name.lower()
-    if "smith" in n:
-        return "Smith machine"
-    if "barbell" in n:
-        return "Barbell"
-    if "dumbbell" in n:
-        return "Dumbbells"
-    if "machine" in n or "pec-deck" in n or "hack squat" in n:
-        return "Machine"
-    if "cable" in n or "pulldown" in n:
-        return "Cable machine"
-    if "band" in n:
-        return "Bands"
-    if "trx" in n or "suspension" in n:
-        return "Suspension trainer (TRX)"
-    if "press-down" in n:
-        return "Cable machine"
-    if "plate" in n:
-        return "Weight plate"
-    if "farmer" in n:
-        return "Farmer's handles / dumbbells"
-    if "walk" in n or "plank" in n or "push-up" in n or "crunch" in n or "mountain climber" in n or "bridge" in n:
-        return "Bodyweight"
-    if "wheel" in n:
-        return "Ab wheel"
-    if "trap bar" in n:
-        return "Trap bar"
-    return "Bodyweight or listed equipment"
+    return EQUIPMENT_MATCHER.infer(name)
 
 
 def instructions(name: str, primary: str) -> list[str]:
@@ -62,7 +107,7 @@ def mistakes() -> list[str]:
     ]
 
 
-def card_html(name: str, primary: str, secondary: str, equipment: str) -> str:
+def card_markup(name: str, primary: str, secondary: str, equipment: str) -> str:
     how_to = instructions(name, primary)
     benes = benefits(primary, secondary)
     errs = mistakes()
@@ -109,27 +154,271 @@ def card_html(name: str, primary: str, secondary: str, equipment: str) -> str:
     </article>"""
 
 
-def wrap_page(content: str, title: str, active: str = "workout") -> str:
+class CardTemplate:
+    """Card markup rendered once with slot sentinels, so its constant text is escaped only once.
+
+    Upper-case sentinels mark a value used as-is; instructions() and benefits()
+    lower-case primary/secondary, which turns their sentinels lower-case too.
+    """
+
+    SENTINEL = re.compile("\x00([A-Za-z])\x00")
+
+    def __init__(self, markup):
+        parts = self.SENTINEL.split(markup("\x00N\x00", "\x00P\x00", "\x00S\x00", "\x00E\x00"))
+        self.head = parts[0]
+        self.pairs = tuple(zip(parts[1::2], parts[2::2]))
+
+    def render(self, name: str, primary: str, secondary: str, equipment: str) -> str:
+        values = {
+            "N": escape(name),
+            "P": escape(primary),
+            "p": escape(primary.lower()),
+            "S": escape(secondary),
+            "s": escape(secondary.lower()),
+            "E": escape(equipment),
+        }
+        out = [self.head]
+        for slot, static in self.pairs:
+            out.append(values[slot])
+            out.append(static)
+        return "".join(out)
+
+
+CARD_TEMPLATE = CardTemplate(card_markup)
+
+
+def card_html(name: str, primary: str, secondary: str, equipment: str) -> str:
+    return CARD_TEMPLATE.render(name, primary, secondary, equipment)
+
+
+class CardShard:
+    """Renders summary-only cards and collects their bodies for the page's JSON shard.
+
+    Each placeholder body links no-JS visitors to fallback, the page's full-HTML version.
+    """
+
+    BODY_OPEN = '<div class="exercise-body">'
+    BODY_CLOSE = "\n        </div>\n      </details>"
+
+    def __init__(self, fallback: str = ""):
+        self.bodies: list[str] = []
+        self.placeholder = (
+            f'<noscript><p><a href="{escape(fallback)}">Open the full exercise details</a></p></noscript>'
+            if fallback
+            else ""
+        )
+
+    def render(self, name: str, primary: str, secondary: str, equipment: str) -> str:
+        card = CARD_CACHE.render(name, primary, secondary, equipment)
+        head, _, rest = card.partition(self.BODY_OPEN)
+        body, _, tail = rest.rpartition(self.BODY_CLOSE)
+        self.bodies.append(_minify_text(body).strip())
+        index = len(self.bodies) - 1
+        return f'{head}<div class="exercise-body" data-index="{index}">{self.placeholder}{self.BODY_CLOSE}{tail}'
+
+    def json(self) -> str:
+        return json.dumps(self.bodies, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+class CardCache:
+    """LRU cache of rendered cards keyed by (name, primary, secondary, equipment)."""
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.track_new = False
+        self._cards: OrderedDict[tuple[str, str, str, str], str] = OrderedDict()
+        self._new: list[tuple[tuple[str, str, str, str], str]] = []
+
+    def render(self, name: str, primary: str, secondary: str, equipment: str) -> str:
+        key = (name, primary, secondary, equipment)
+        html = self._cards.get(key)
+        if html is not None:
+            self._cards.move_to_end(key)
+            self.hits += 1
+            return html
+        self.misses += 1
+        html = card_html(name, primary, secondary, equipment)
+        self.add(key, html)
+        if self.track_new:
+            self._new.append((key, html))
+        return html
+
+    def add(self, key: tuple[str, str, str, str], html: str) -> None:
+        self._cards[key] = html
+        self._cards.move_to_end(key)
+        if len(self._cards) > self.maxsize:
+            self._cards.popitem(last=False)
+
+    def drain_new(self) -> list[tuple[tuple[str, str, str, str], str]]:
+        new, self._new = self._new, []
+        return new
+
+    def load(self, path: str, code_hash: str) -> None:
+        """Load cards persisted by save(); entries from other generator code are ignored."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("generator") != code_hash:
+            return
+        for name, primary, secondary, equipment, html in data.get("cards", []):
+            self.add((name, primary, secondary, equipment), html)
+
+    def save(self, path: str, code_hash: str) -> None:
+        cards = [[*key, html] for key, html in self._cards.items()]
+        write_atomic(path, [json.dumps({"generator": code_hash, "cards": cards}, ensure_ascii=False), "\n"])
+
+
+CARD_CACHE = CardCache()
+
+
+NAV_LINKS = [
+    ("home", "Home", "index.html"),
+    ("about", "About", "about.html"),
+    ("workout", "Workout", "workout.html"),
+    ("diet", "Diet", "diet.html"),
+    ("lifestyle", "Lifestyle", "lifestyle.html"),
+    ("selfdev", "Self Dev.", "self-development.html"),
+    ("tools", "Tools", "tools.html"),
+    ("blog", "Blog", "blog.html"),
+    ("gallery", "Gallery", "gallery.html"),
+    ("youtube", "YouTube", "youtube.html"),
+    ("contact", "Contact", "contact.html"),
+]
+
+
+def nav_html(active: str) -> str:
     def nav_link(key: str, label: str, href: str) -> str:
         active_class = ' class="active"' if key == active else ""
         return f'        <a{active_class} href="{href}">{label}</a>'
 
-    nav = "\n".join(
-        [
-            nav_link("home", "Home", "index.html"),
-            nav_link("about", "About", "about.html"),
-            nav_link("workout", "Workout", "workout.html"),
-            nav_link("diet", "Diet", "diet.html"),
-            nav_link("lifestyle", "Lifestyle", "lifestyle.html"),
-            nav_link("selfdev", "Self Dev.", "self-development.html"),
-            nav_link("tools", "Tools", "tools.html"),
-            nav_link("blog", "Blog", "blog.html"),
-            nav_link("gallery", "Gallery", "gallery.html"),
-            nav_link("youtube", "YouTube", "youtube.html"),
-            nav_link("contact", "Contact", "contact.html"),
-        ]
-    )
+    return "\n".join(nav_link(key, label, href) for key, label, href in NAV_LINKS)
+
 
+EXERCISE_CARDS_JS = """\
+(() => {
+  // Single-open mode keeps one card in focus; only that card and its grid are touched per click.
+  let expandMode = false;
+  let activeCard = null;
+  let focusedGrid = null;
+  let openDetails = null;
+  let allDetails = null;
+  const getDetails = () => (allDetails ??= document.querySelectorAll('.exercise-card details'));
+
+  const clearFocus = () => {
+    activeCard?.classList.remove('active-card');
+    focusedGrid?.classList.remove('single-focus');
+    activeCard = focusedGrid = null;
+  };
+
+  const focusCard = (summary) => {
+    const details = summary.closest('details');
+    const card = summary.closest('.exercise-card');
+    // Close the previously opened card; the clicked one toggles itself afterwards.
+    if (openDetails && openDetails !== details) openDetails.removeAttribute('open');
+    openDetails = details;
+    if (activeCard !== card) {
+      activeCard?.classList.remove('active-card');
+      card.classList.add('active-card');
+      activeCard = card;
+    }
+    const grid = card.closest('.exercise-grid');
+    if (focusedGrid !== grid) {
+      focusedGrid?.classList.remove('single-focus');
+      grid?.classList.add('single-focus');
+      focusedGrid = grid;
+    }
+  };
+
+  document.addEventListener('click', (e) => {
+    const button = e.target.closest('[data-action]');
+    if (button) {
+      const act = button.getAttribute('data-action');
+      if (act === 'expand-all' || act === 'collapse-all') {
+        expandMode = act === 'expand-all';
+        getDetails().forEach((d) => (expandMode ? d.setAttribute('open', 'true') : d.removeAttribute('open')));
+        openDetails = null;
+        clearFocus();
+      }
+      return;
+    }
+    const summary = e.target.closest('summary.exercise-toggle');
+    // In expand-all mode cards open and close independently.
+    if (summary && !expandMode) focusCard(summary);
+  });
+
+  // Closing a card by hand leaves single-focus. toggle does not bubble, so listen in the capture phase.
+  document.addEventListener('toggle', (e) => {
+    const details = e.target;
+    if (expandMode || details.open || !details.matches?.('.exercise-card details')) return;
+    if (details === openDetails) openDetails = null;
+    clearFocus();
+  }, true);
+})();
+
+document.getElementById("year").textContent = new Date().getFullYear();
+"""
+
+
+def asset_fingerprint(content: str | bytes) -> str:
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()[:10]
+
+
+def fingerprinted_path(path: str, content: str | bytes) -> str:
+    """path with the content hash before its extension: js/main.js -> js/main.<sha10>.js."""
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{asset_fingerprint(content)}{ext}"
+
+
+EXERCISE_CARDS_SCRIPT = fingerprinted_path("js/exercise-cards.js", EXERCISE_CARDS_JS)
+
+# Hydrates lazily rendered cards: the page's shard is fetched once, on the
+# first <details> opened, and each card body is filled from it by index.
+EXERCISE_SHARDS_JS = """\
+(() => {
+  const meta = document.querySelector('meta[name="card-shard"]');
+  if (!meta) return;
+  const fallback = document.querySelector('link[rel="alternate"][type="text/html"]');
+  let shard = null;
+  const load = () => {
+    shard ??= fetch(meta.content).then((res) => {
+      if (!res.ok) throw new Error(`HTTP ${res.status}`);
+      return res.json();
+    });
+    return shard;
+  };
+
+  const hydrate = (details) => {
+    const body = details.querySelector('.exercise-body[data-index]');
+    if (!body || body.dataset.loaded) return;
+    body.dataset.loaded = 'true';
+    load()
+      .then((bodies) => {
+        body.innerHTML = bodies[Number(body.dataset.index)] || '';
+      })
+      .catch(() => {
+        shard = null;
+        delete body.dataset.loaded;
+        if (fallback) body.innerHTML = `<p><a href="${fallback.href}">Open the full exercise details</a></p>`;
+      });
+  };
+
+  // toggle does not bubble, so listen in the capture phase.
+  document.addEventListener('toggle', (e) => {
+    if (e.target.matches?.('.exercise-card details') && e.target.open) hydrate(e.target);
+  }, true);
+})();
+"""
+
+EXERCISE_SHARDS_SCRIPT = fingerprinted_path("js/exercise-shards.js", EXERCISE_SHARDS_JS)
+
+
+def page_template(title: str, nav: str, content: str, head: str = "") -> str:
     return f"""<!DOCTYPE html>
 <html lang="en">
 <head>
@@ -140,7 +429,7 @@ def wrap_page(content: str, title: str, active: str = "workout") -> str:
   <link rel="preconnect" href="https://fonts.googleapis.com">
   <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@400;500;600;700;800&display=swap" rel="stylesheet">
   <link rel="stylesheet" href="assets/css/style.css">
-</head>
+{head}</head>
 <body>
   <header class="navbar">
     <div class="wrapper nav-inner">
@@ -168,546 +457,1784 @@ def wrap_page(content: str, title: str, active: str = "workout") -> str:
   </footer>
 
   <script src="js/main.js"></script>
-  <script>
-    (() => {{
-      const buttons = document.querySelectorAll('[data-action]');
-      const getDetails = () => Array.from(document.querySelectorAll('.exercise-card details'));
-      const getGrid = () => document.querySelector('.exercise-grid');
-      const getCards = () => Array.from(document.querySelectorAll('.exercise-card'));
-      let expandMode = false;
-
-      // Single-open behavior: open one, close others
-      document.addEventListener('click', (e) => {{
-        const summary = e.target.closest('summary.exercise-toggle');
-        if (!summary) return;
-        if (expandMode) return; // in expand-all mode, keep standard behavior
-        const currentDetails = summary.closest('details');
-        const currentCard = summary.closest('.exercise-card');
-        const grid = getGrid();
-        // Close others
-        getDetails().forEach((d) => {{
-          if (d !== currentDetails) d.removeAttribute('open');
-        }});
-        getCards().forEach((c) => c.classList.remove('active-card'));
-        currentCard.classList.add('active-card');
-        grid?.classList.add('single-focus');
-      }});
-
-      buttons.forEach((btn) => {{
-        btn.addEventListener('click', () => {{
-          const act = btn.getAttribute('data-action');
-          if (act === 'expand-all') {{
-            getDetails().forEach((d) => d.setAttribute('open', 'true'));
-            expandMode = true;
-            getCards().forEach((c) => c.classList.remove('active-card'));
-            getGrid()?.classList.remove('single-focus');
-          }} else if (act === 'collapse-all') {{
-            getDetails().forEach((d) => d.removeAttribute('open'));
-            expandMode = false;
-            getCards().forEach((c) => c.classList.remove('active-card'));
-            getGrid()?.classList.remove('single-focus');
-          }}
-        }});
-      }});
-
-      // If user manually closes an open detail, reset single-focus
-      getDetails().forEach((d) => {{
-        d.addEventListener('toggle', () => {{
-          if (!expandMode && !d.open) {{
-            getCards().forEach((c) => c.classList.remove('active-card'));
-            getGrid()?.classList.remove('single-focus');
-          }}
-        }});
-      }});
-    }})();
-  </script>
-  <script>document.getElementById("year").textContent = new Date().getFullYear();</script>
+  <script src="{EXERCISE_CARDS_SCRIPT}" defer></script>
 </body>
 </html>
 """
 
 
-def page_html(title: str, intro: list[str], exercises: list[dict]) -> str:
-    intro_html = "\n    ".join(f"<p>{escape(p)}</p>" for p in intro)
-    cards = "\n\n".join(
-        card_html(
-            ex["name"],
-            ex.get("primary") or ex["default_primary"],
-            ex.get("secondary") or ex["default_secondary"],
-            ex.get("equipment") or equip_infer(ex["name"]),
+ASSET_REFERENCE = re.compile(r'\b(href|src)="([^"]*)"')
+
+
+def rewrite_asset_refs(html: str, assets: dict[str, str]) -> str:
+    """Point href/src attributes naming an original asset at its fingerprinted copy."""
+    if not assets:
+        return html
+    return ASSET_REFERENCE.sub(lambda m: f'{m.group(1)}="{assets.get(m.group(2), m.group(2))}"', html)
+
+
+class PageShell:
+    """The page template split once into static segments around its title, head, nav and content slots.
+
+    assets maps original asset paths to fingerprinted ones; references in the static segments are rewritten once.
+    defer_css turns the stylesheet links into non-blocking preloads, for pages that inline their critical CSS.
+    """
+
+    TITLE = "\x00title\x00"
+    HEAD = "\x00head\x00"
+    NAV = "\x00nav\x00"
+    CONTENT = "\x00content\x00"
+
+    def __init__(self, assets: tuple[tuple[str, str], ...] = (), defer_css: bool = False):
+        template = rewrite_asset_refs(page_template(self.TITLE, self.NAV, self.CONTENT, self.HEAD), dict(assets))
+        if defer_css:
+            template = defer_stylesheets(template)
+        self.prefix, rest = template.split(self.TITLE)
+        self.after_title, rest = rest.split(self.HEAD)
+        self.after_head, rest = rest.split(self.NAV)
+        self.before_content, self.suffix = rest.split(self.CONTENT)
+        self._navs: dict[str, str] = {}
+
+    def nav(self, active: str) -> str:
+        nav = self._navs.get(active)
+        if nav is None:
+            nav = self._navs[active] = nav_html(active)
+        return nav
+
+    def segments(self, content: str, title: str, active: str = "workout", head: str = "") -> tuple[str, ...]:
+        return (
+            self.prefix,
+            escape(title),
+            self.after_title,
+            head,
+            self.after_head,
+            self.nav(active),
+            self.before_content,
+            content,
+            self.suffix,
         )
-        for ex in exercises
+
+    def render(self, content: str, title: str, active: str = "workout", head: str = "") -> str:
+        return "".join(self.segments(content, title, active, head))
+
+    def iter_render(self, fragments, title: str, active: str = "workout", head: str = ""):
+        yield self.prefix
+        yield escape(title)
+        yield self.after_title
+        yield head
+        yield self.after_head
+        yield self.nav(active)
+        yield self.before_content
+        yield from fragments
+        yield self.suffix
+
+
+PAGE_SHELL = PageShell()
+
+
+@functools.lru_cache(maxsize=None)
+def page_shell(assets: tuple[tuple[str, str], ...] = (), defer_css: bool = False) -> PageShell:
+    return PageShell(assets, defer_css) if assets or defer_css else PAGE_SHELL
+
+
+def wrap_page(content: str, title: str, active: str = "workout") -> str:
+    return PAGE_SHELL.render(content, title, active)
+
+
+# The site sources: the catalog and the hand-maintained assets are read from here, whatever --out is.
+SITE_DIR = os.path.dirname(os.path.abspath(__file__))
+CATALOG_FILE = os.path.join(SITE_DIR, "workout_catalog.toml")
+# Kept beside the catalog it caches, so every build directory shares it; None disables the cache.
+CATALOG_CACHE_FILE = os.path.join(SITE_DIR, ".catalog-cache.bin")
+# Bump when the cached layout changes; the Python version is stamped too because marshal's format is per-version.
+CATALOG_CACHE_VERSION = 1
+
+
+class Record:
+    """Compact catalog record: fields are the subclass's __slots__, set positionally."""
+
+    __slots__ = ()
+
+    def __init__(self, *values):
+        if len(values) != len(self.__slots__):
+            raise TypeError(f"{type(self).__name__} takes {len(self.__slots__)} fields, got {len(values)}")
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def astuple(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.astuple() == other.astuple()
+
+    def __repr__(self):
+        return f"{type(self).__name__}{self.astuple()!r}"
+
+
+class ExerciseGroup(Record):
+    """One generated muscle page; every exercise shares the group's muscles."""
+
+    __slots__ = ("filename", "title", "intro", "default_primary", "default_secondary", "exercises")
+
+
+class LegSection(Record):
+    __slots__ = ("title", "primary", "secondary", "exercises")
+
+
+class Catalog(Record):
+    __slots__ = ("groups", "leg_intro", "leg_sections", "abs_intro", "abs_primary", "abs_secondary", "abs_exercises")
+
+
+def catalog_state(data: dict) -> tuple:
+    """Parsed catalog source reduced to the nested tuples the records are built from."""
+    return (
+        tuple(
+            (
+                group["filename"],
+                group["title"],
+                tuple(group["intro"]),
+                group["default_primary"],
+                group["default_secondary"],
+                tuple(group["exercises"]),
+            )
+            for group in data["groups"]
+        ),
+        tuple(data["legs"]["intro"]),
+        tuple(
+            (section["title"], section["primary"], section["secondary"], tuple(section["exercises"]))
+            for section in data["legs"]["sections"]
+        ),
+        tuple(data["abs"]["intro"]),
+        data["abs"]["primary"],
+        data["abs"]["secondary"],
+        tuple(data["abs"]["exercises"]),
     )
-    return f"""<main>
-  <div class="wrapper">
-    <header class="page-header">
-      <h1>{escape(title)}</h1>
-      {intro_html}
-    </header>
-    <div class="exercise-actions">
+
+
+def catalog_from_state(state: tuple) -> Catalog:
+    groups, leg_intro, leg_sections, *abs_fields = state
+    return Catalog(
+        tuple(ExerciseGroup(*group) for group in groups),
+        leg_intro,
+        tuple(LegSection(*section) for section in leg_sections),
+        *abs_fields,
+    )
+
+
+def load_catalog(path: str = CATALOG_FILE, cache_path: str | None = CATALOG_CACHE_FILE) -> Catalog:
+    """Read the TOML catalog, reusing the marshal cache at cache_path while the source hash matches."""
+    with open(path, "rb") as f:
+        source = f.read()
+    stamp = f"{CATALOG_CACHE_VERSION}:{sys.version_info[0]}.{sys.version_info[1]}:{hashlib.sha256(source).hexdigest()}\n"
+    stamp = stamp.encode("ascii")
+    if cache_path:
+        try:
+            with open(cache_path, "rb") as f:
+                cached = f.read()
+            if cached.startswith(stamp):
+                return catalog_from_state(marshal.loads(cached[len(stamp) :]))
+        except (OSError, ValueError, EOFError, TypeError):
+            pass
+    state = catalog_state(tomllib.loads(source.decode("utf-8")))
+    if cache_path:
+        try:
+            write_atomic(cache_path, [stamp, marshal.dumps(state)], binary=True)
+        except OSError:
+            pass
+    return catalog_from_state(state)
+
+
+@functools.lru_cache(maxsize=None)
+def catalog() -> Catalog:
+    return load_catalog(CATALOG_FILE, CATALOG_CACHE_FILE)
+
+
+class PageSection(Record):
+    """One card grid. heading is None for a page's single untitled grid.
+
+    exercises are names, carded with the section's muscles and inferred
+    equipment, or dicts with a "name" and any "primary", "secondary" or
+    "equipment" overrides; they are consumed once, so a generator works.
+    """
+
+    __slots__ = ("heading", "primary", "secondary", "exercises")
+
+
+class PageModel(Record):
+    """A muscle page: title, intro paragraphs and its sections, rendered by iter_page()."""
+
+    __slots__ = ("title", "intro", "sections")
+
+
+PAGE_ACTIONS = """    <div class="exercise-actions">
       <button class="button" data-action="expand-all">Expand All</button>
       <button class="button-secondary" data-action="collapse-all">Collapse All</button>
     </div>
-
+"""
+GRID_OPEN = """
     <section class="exercise-grid">
-{cards}
+"""
+GRID_CLOSE = """
     </section>
-  </div>
+"""
+SUBSECTION_CLOSE = """
+    </div>
+  </section>
+"""
+CARD_SEPARATOR = "\n\n"
+PAGE_CLOSE = """  </div>
 </main>
 """
 
 
-def legs_page():
-    sections = [
-        (
-            "Quads (Quadriceps)",
-            "Quadriceps (quads)",
-            "Glutes, core, adductors",
-            [
-                "Back Squat",
-                "Front Squat",
-                "Hack Squat (Machine)",
-                "Leg Press",
-                "Walking Lunge",
-                "Reverse Lunge",
-                "Bulgarian Split Squat",
-                "Step-Up",
-                "Leg Extension",
-            ],
-        ),
-        (
-            "Hamstrings",
-            "Hamstrings",
-            "Glutes, lower back, calves",
-            [
-                "Romanian Deadlift",
-                "Stiff-Leg Deadlift",
-                "Good Morning",
-                "Lying Leg Curl (Machine)",
-                "Seated Leg Curl",
-                "Standing Leg Curl",
-                "Glute-Ham Raise",
-            ],
-        ),
-        (
-            "Glutes",
-            "Gluteus maximus",
-            "Hamstrings, quads, core",
-            [
-                "Barbell Hip Thrust",
-                "Glute Bridge",
-                "Bulgarian Split Squat",
-                "Walking Lunge",
-                "Step-Up",
-            ],
-        ),
-        (
-            "Calves",
-            "Gastrocnemius and soleus",
-            "Feet/ankle stabilizers",
-            [
-                "Standing Calf Raise",
-                "Seated Calf Raise",
-                "Donkey Calf Raise",
-                "Leg Press Calf Raise",
-                "Single-Leg Calf Raise",
-            ],
-        ),
-    ]
-
-    parts = []
-    for title, primary, secondary, names in sections:
-        cards = "\n\n".join(
-            card_html(
+def section_cards(section: PageSection):
+    """Yield (name, primary, secondary, equipment) for each of a section's exercises."""
+    primary, secondary = section.primary, section.secondary
+    for ex in section.exercises:
+        if type(ex) is str:
+            yield ex, primary, secondary, equip_infer(ex)
+        else:
+            # default_primary/default_secondary are what page_html() callers have always passed.
+            name = ex["name"]
+            yield (
                 name,
-                primary,
-                secondary,
-                equip_infer(name),
+                ex.get("primary") or ex.get("default_primary") or primary,
+                ex.get("secondary") or ex.get("default_secondary") or secondary,
+                ex.get("equipment") or equip_infer(name),
             )
-            for name in names
-        )
-        parts.append(
-            f"""  <section class="muscle-subsection">
-    <h2>{escape(title)}</h2>
-    <div class="exercise-grid">
-{cards}
-    </div>
-  </section>"""
-        )
 
-    intro = [
-        "Complete lower-body training across quads, hamstrings, glutes, and calves.",
-        "Mix bilateral and unilateral work plus hinges to build strength, size, and resilience.",
-    ]
-    intro_html = "\n    ".join(f"<p>{escape(p)}</p>" for p in intro)
-    body_sections = "\n".join(parts)
-    return f"""<main>
+
+def iter_page(page: PageModel, card=None, pager=None):
+    """Yield a muscle page's <main> fragments in one pass over its model.
+
+    A page whose only section has no heading is a single flat grid; otherwise
+    each section is a headed subsection. pager() is called after the cards
+    for markup placed below them.
+    """
+    render = card or CARD_CACHE.render
+    intro_html = "\n    ".join(f"<p>{escape(p)}</p>" for p in page.intro)
+    yield f"""<main>
   <div class="wrapper">
     <header class="page-header">
-      <h1>Leg Training</h1>
+      <h1>{escape(page.title)}</h1>
       {intro_html}
     </header>
-    <div class="exercise-actions">
-      <button class="button" data-action="expand-all">Expand All</button>
-      <button class="button-secondary" data-action="collapse-all">Collapse All</button>
-    </div>
-{body_sections}
-  </div>
-</main>
+{PAGE_ACTIONS}"""
+    flat = len(page.sections) == 1 and page.sections[0].heading is None
+    for section in page.sections:
+        if flat:
+            yield GRID_OPEN
+        else:
+            yield f"""  <section class="muscle-subsection">
+    <h2>{escape(section.heading)}</h2>
+    <div class="exercise-grid">
 """
+        for i, args in enumerate(section_cards(section)):
+            if i:
+                yield CARD_SEPARATOR
+            yield render(*args)
+        yield GRID_CLOSE if flat else SUBSECTION_CLOSE
+    if pager is not None:
+        yield pager()
+    yield PAGE_CLOSE
 
 
-def abs_page():
-    title = "Abs & Core Training"
-    intro = [
-        "Core stability and abdominal strength to protect the spine and improve power transfer.",
-        "Blend anti-extension, anti-rotation, and flexion movements for a complete core.",
-    ]
-    exercises = [
-        "Crunch",
-        "Reverse Crunch",
-        "Bicycle Crunch",
-        "Hanging Leg Raise",
-        "Lying Leg Raise",
-        "Knee Raise (Captain’s Chair)",
-        "Plank",
-        "Side Plank",
-        "Russian Twist",
-        "Cable Woodchop",
-        "Decline Bench Sit-Up",
-        "Ab Wheel Rollout",
-        "Mountain Climber",
+def group_model(group: ExerciseGroup) -> PageModel:
+    return PageModel(
+        group.title,
+        group.intro,
+        (PageSection(None, group.default_primary, group.default_secondary, group.exercises),),
+    )
+
+
+def legs_model() -> PageModel:
+    data = catalog()
+    sections = tuple(
+        PageSection(section.title, section.primary, section.secondary, section.exercises)
+        for section in data.leg_sections
+    )
+    return PageModel("Leg Training", data.leg_intro, sections)
+
+
+def abs_model() -> PageModel:
+    data = catalog()
+    return PageModel(
+        "Abs & Core Training",
+        data.abs_intro,
+        (PageSection(None, data.abs_primary, data.abs_secondary, data.abs_exercises),),
+    )
+
+
+def page_html(title: str, intro: list[str], exercises: list[dict]) -> str:
+    return "".join(iter_page(PageModel(title, intro, (PageSection(None, "", "", exercises),))))
+
+
+def legs_page() -> str:
+    return "".join(iter_page(legs_model()))
+
+
+def abs_page() -> str:
+    return "".join(iter_page(abs_model()))
+
+
+MANIFEST_FILE = ".build-manifest.json"
+CARD_CACHE_FILE = ".card-cache.json"
+WRITE_BUFFER_SIZE = 64 * 1024
+
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+# Hand-maintained assets under SITE_DIR that --fingerprint copies under content-hashed names.
+FINGERPRINTED_ASSETS = ["assets/css/style.css", "style.css", "js/main.js", "js/layout.js"]
+ASSET_MANIFEST_FILE = "asset-manifest.json"
+HEADERS_FILE = "_headers"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+HTML_CACHE_CONTROL = "public, max-age=300, must-revalidate"
+
+
+def write_fingerprinted_asset(path: str, content: str | bytes) -> list[str]:
+    """Write a content-hashed asset if missing and delete older fingerprints of it.
+
+    Returns the stale paths that were removed.
+    """
+    directory, filename = os.path.split(path)
+    stem, _, ext = filename.partition(".")
+    ext = ext.rsplit(".", 1)[-1]
+    os.makedirs(directory or ".", exist_ok=True)
+    if not os.path.exists(path):
+        write_atomic(path, [content], binary=isinstance(content, bytes))
+    removed = []
+    # Precompressed siblings of old fingerprints go too.
+    pattern = re.compile(rf"{re.escape(stem)}\.[0-9a-f]{{10}}\.{re.escape(ext)}(\.gz)?")
+    for other in sorted(os.listdir(directory or ".")):
+        if other not in (filename, filename + ".gz") and pattern.fullmatch(other):
+            os.remove(os.path.join(directory, other))
+            removed.append(os.path.join(directory, other))
+    return removed
+
+
+def fingerprint_assets(paths: list[str], write: bool = True) -> tuple[dict[str, str], list[str]]:
+    """Write a content-hashed copy of each path under SITE_DIR that exists, into the output directory.
+
+    Returns ({original: fingerprinted}, stale fingerprints removed).
+    """
+    assets, removed = {}, []
+    for path in paths:
+        try:
+            with open(os.path.join(SITE_DIR, path), "rb") as f:
+                content = f.read()
+        except FileNotFoundError:
+            continue
+        assets[path] = fingerprinted_path(path, content)
+        if write:
+            removed += write_fingerprinted_asset(assets[path], content)
+    return assets, removed
+
+
+def headers_file(immutable: list[str], revalidated: list[str]) -> str:
+    """A Netlify/Cloudflare Pages style _headers file giving each path its Cache-Control."""
+    rules = [(path, IMMUTABLE_CACHE_CONTROL) for path in immutable]
+    rules += [(path, HTML_CACHE_CONTROL) for path in revalidated]
+    return "".join(f"/{path.lstrip('/')}\n  Cache-Control: {value}\n" for path, value in rules)
+
+
+def generator_fingerprint() -> str:
+    # Exercise data lives in CATALOG_FILE and is hashed per page, so a data edit only dirties its own page.
+    with open(__file__, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def model_spec(filename: str, kind: str, inputs, title: str, page: PageModel) -> dict:
+    return {
+        "filename": filename,
+        "kind": kind,
+        "inputs": inputs,
+        "title": title,
+        "page": page,
+        "render": functools.partial(iter_page, page),
+    }
+
+
+def group_spec(group: ExerciseGroup) -> dict:
+    return model_spec(group.filename, "group", group, f"TheFitBhaskar.in | {group.title}", group_model(group))
+
+
+def page_specs() -> list[dict]:
+    """Every generated page, in build order.
+
+    A spec's page is its PageModel and render(card) yields the page's <main>
+    fragments from it; inputs is the catalog data hashed into its manifest key.
+    """
+    data = catalog()
+    specs = [group_spec(group) for group in data.groups]
+    legs_inputs = {"intro": data.leg_intro, "sections": data.leg_sections}
+    specs.append(model_spec("legs.html", "legs", legs_inputs, "TheFitBhaskar.in | Leg Training", legs_model()))
+    abs_inputs = {
+        "intro": data.abs_intro,
+        "primary": data.abs_primary,
+        "secondary": data.abs_secondary,
+        "exercises": data.abs_exercises,
+    }
+    specs.append(model_spec("abs.html", "abs", abs_inputs, "TheFitBhaskar.in | Abs & Core", abs_model()))
+    return specs
+
+
+def page_id(spec: dict) -> str:
+    return os.path.splitext(spec["filename"])[0]
+
+
+def page_registry() -> dict[str, dict]:
+    """Page id (the filename stem, e.g. "chest") -> spec."""
+    return {page_id(spec): spec for spec in page_specs()}
+
+
+def iter_spec(spec: dict, card=None, head: str = "", shell: PageShell = PAGE_SHELL):
+    return shell.iter_render(spec["render"](card), spec["title"], "workout", head)
+
+
+def page_title(spec: dict) -> str:
+    return spec["page"].title
+
+
+def iter_sections(spec: dict):
+    """Yield (heading, cards) for each card grid on a page; cards are (name, primary, secondary, equipment)."""
+    page = spec["page"]
+    for section in page.sections:
+        yield section.heading or page.title, list(section_cards(section))
+
+
+def iter_exercises(spec: dict):
+    """Yield (name, primary, secondary, equipment) for every card on a page, in page order."""
+    for _, cards in iter_sections(spec):
+        yield from cards
+
+
+def render_spec(spec: dict, card=None, head: str = "", shell: PageShell = PAGE_SHELL) -> str:
+    return "".join(iter_spec(spec, card, head, shell))
+
+
+def write_atomic(path: str, fragments, binary: bool = False) -> None:
+    """Stream fragments into a temp file beside path, then rename it over path."""
+    fd, tmp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        mode, encoding = ("wb", None) if binary else ("w", "utf-8")
+        with os.fdopen(fd, mode, encoding=encoding, buffering=WRITE_BUFFER_SIZE) as f:
+            f.writelines(fragments)
+        os.chmod(tmp_path, 0o666 & ~UMASK)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# Elements whose content keeps its whitespace; the minifier copies them verbatim.
+RAW_TEXT_BLOCK = re.compile(r"<(pre|textarea|script|style)\b[^>]*>.*?</\1\s*>", re.S | re.I)
+RAW_TEXT_PLACEHOLDER = re.compile(r"<[A-Za-z]+ \x00(\d+)\x00>")
+HTML_COMMENT = re.compile(r"<!--(?!\[if).*?-->", re.S)
+HTML_WHITESPACE = re.compile(r"[ \t\n\r\f]+")
+SPACE_BEFORE_TAG = re.compile(r" (?=<(/?)([A-Za-z][\w-]*|!))")
+TAG_NAME = re.compile(r"</?([A-Za-z][\w-]*|!)")
+# Whitespace touching these tags never renders, so it can be dropped rather than collapsed.
+BLOCK_TAGS = {
+    "!", "html", "head", "body", "meta", "link", "title", "script", "style", "main", "div", "header",
+    "footer", "nav", "section", "article", "details", "summary", "p", "h1", "h2", "h3", "h4", "h5",
+    "h6", "ol", "ul", "li", "pre", "noscript",
+}
+
+
+def _minify_text(text: str) -> str:
+    text = HTML_WHITESPACE.sub(" ", HTML_COMMENT.sub("", text))
+
+    def drop_between_tags(match: re.Match) -> str:
+        start = match.start()
+        if start == 0 or text[start - 1] != ">":
+            return " "
+        previous = TAG_NAME.match(text, text.rfind("<", 0, start))
+        before = previous.group(1).lower() if previous else ""
+        if before in BLOCK_TAGS or match.group(2).lower() in BLOCK_TAGS:
+            return ""
+        return " "
+
+    return SPACE_BEFORE_TAG.sub(drop_between_tags, text)
+
+
+def minify_html(html: str) -> str:
+    """Collapse whitespace and strip comments outside pre/textarea/script/style blocks."""
+    blocks = []
+
+    def stash(match: re.Match) -> str:
+        # A same-named placeholder tag lets the whitespace rules see the block's tag.
+        blocks.append(match.group(0))
+        return f"<{match.group(1)} \x00{len(blocks) - 1}\x00>"
+
+    text = _minify_text(RAW_TEXT_BLOCK.sub(stash, html))
+    return RAW_TEXT_PLACEHOLDER.sub(lambda m: blocks[int(m.group(1))], text).strip() + "\n"
+
+
+CRITICAL_CSS_SOURCE = "assets/css/style.css"
+CRITICAL_CSS_SLOT = "\x00critical-css\x00"
+CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+CSS_SELECTOR_LIST = re.compile(r",(?![^(]*\))")
+CSS_DECLARATION_SPACE = re.compile(r"\s*([;:,{}])\s*")
+CSS_IGNORED_PARTS = re.compile(r"::?[\w-]+(\([^)]*\))?|\[[^\]]*\]")
+CSS_SIMPLE_SELECTOR = re.compile(r"([.#]?)(-?[A-Za-z_][\w-]*)")
+CSS_KEYFRAMES = re.compile(r"@(?:-webkit-)?keyframes\s+([\w-]+)")
+PAGE_TAG = re.compile(r"<([A-Za-z][\w-]*)")
+PAGE_CLASS = re.compile(r'\bclass="([^"]*)"')
+PAGE_ID = re.compile(r'\bid="([^"]*)"')
+STYLESHEET_LINK = re.compile(r'<link (?=[^>]*rel="stylesheet")[^>]*>')
+CSS_URL = re.compile(r"""url\(\s*(["']?)([^"')]*)\1\s*\)""", re.I)
+# Scheme (data:, https:), protocol-relative, root-relative and fragment-only URLs resolve the same from any page.
+CSS_URL_UNMOVED = re.compile(r"^(?:[A-Za-z][A-Za-z0-9+.-]*:|/|#)")
+
+
+def parse_stylesheet(css: str, media: tuple[str, ...] = ()) -> list[tuple[tuple[str, ...], str, str]]:
+    """Flatten css into (enclosing @media/@supports preludes, prelude, body) rules, in source order."""
+    css = CSS_COMMENT.sub("", css)
+    rules = []
+    pos = 0
+    while (start := css.find("{", pos)) >= 0:
+        depth, end = 1, start + 1
+        while depth and end < len(css):
+            depth += {"{": 1, "}": -1}.get(css[end], 0)
+            end += 1
+        # Statement at-rules (@import, @charset) end in ";" and have no block of their own.
+        prelude = " ".join(css[pos:start].rsplit(";", 1)[-1].split())
+        body = css[start + 1 : end - 1]
+        if prelude.startswith(("@media", "@supports")):
+            rules += parse_stylesheet(body, media + (prelude,))
+        else:
+            rules.append((media, prelude, body))
+        pos = end
+    return rules
+
+
+@functools.lru_cache(maxsize=None)
+def stylesheet_rules(path: str, digest: str) -> list[tuple[tuple[str, ...], str, str]]:
+    """Parsed rules of path; digest is its content hash, so an edited file is parsed again."""
+    with open(path, encoding="utf-8") as f:
+        return parse_stylesheet(f.read())
+
+
+def page_selectors(html: str) -> tuple[set[str], set[str], set[str]]:
+    """The (tags, classes, ids) present in html."""
+    tags = {tag.lower() for tag in PAGE_TAG.findall(html)}
+    classes = {name for value in PAGE_CLASS.findall(html) for name in value.split()}
+    ids = set(PAGE_ID.findall(html))
+    return tags, classes, ids
+
+
+def selector_matches(selector: str, tags: set[str], classes: set[str], ids: set[str]) -> bool:
+    """Whether every tag, class and id named in selector occurs on the page.
+
+    Pseudo-classes and attribute tests are ignored, so this over-approximates: it
+    never drops a rule the page could need at first paint.
+    """
+    for kind, name in CSS_SIMPLE_SELECTOR.findall(CSS_IGNORED_PARTS.sub(" ", selector)):
+        if kind == "." and name not in classes or kind == "#" and name not in ids:
+            return False
+        if not kind and name.lower() not in tags:
+            return False
+    return True
+
+
+def rebase_css_urls(body: str, base: str) -> str:
+    """Rewrite body's relative url() values, written relative to directory base, to be relative to the site root."""
+
+    def rebased(m):
+        quote, url = m.group(1), m.group(2).strip()
+        if not url or CSS_URL_UNMOVED.match(url):
+            return m.group(0)
+        return f"url({quote}{posixpath.normpath(posixpath.join(base, url))}{quote})"
+
+    return CSS_URL.sub(rebased, body) if base else body
+
+
+def critical_css(html: str, rules: list[tuple[tuple[str, ...], str, str]], base: str = "") -> tuple[str, int]:
+    """The rules whose selectors match html, compacted; returns (css, rule count).
+
+    base is the stylesheet's directory relative to the site root; relative url()
+    values are rebased from it, since the rules are inlined into root-level pages.
+    """
+    tags, classes, ids = page_selectors(html)
+    kept, keyframes = [], []
+    for media, prelude, body in rules:
+        if prelude.startswith("@"):
+            name = CSS_KEYFRAMES.match(prelude)
+            if name:
+                keyframes.append((media, prelude, body, name.group(1)))
+            elif prelude.startswith("@font-face"):
+                kept.append((media, prelude, CSS_DECLARATION_SPACE.sub(r"\1", body.strip())))
+            continue
+        selectors = [s.strip() for s in CSS_SELECTOR_LIST.split(prelude) if selector_matches(s, tags, classes, ids)]
+        if selectors:
+            kept.append((media, ",".join(selectors), CSS_DECLARATION_SPACE.sub(r"\1", body.strip())))
+    used = " ".join(body for _, _, body in kept)
+    kept += [
+        (media, prelude, " ".join(body.split()))
+        for media, prelude, body, name in keyframes
+        if re.search(rf"\b{re.escape(name)}\b", used)
     ]
-    ex_dicts = [
+    parts = []
+    for media, prelude, body in kept:
+        rule = f"{prelude}{{{rebase_css_urls(body, base)}}}"
+        for condition in reversed(media):
+            rule = f"{condition}{{{rule}}}"
+        parts.append(rule)
+    return "".join(parts), len(kept)
+
+
+def defer_stylesheets(html: str) -> str:
+    """Turn render-blocking stylesheet links into preloads applied on load, with a no-JS fallback."""
+
+    def deferred(m):
+        link = m.group(0)
+        preload = link.replace('rel="stylesheet"', 'rel="preload" as="style" onload="this.onload=null;this.rel=\'stylesheet\'"')
+        return f"{preload}\n  <noscript>{link}</noscript>"
+
+    return STYLESHEET_LINK.sub(deferred, html)
+
+
+@dataclass(frozen=True)
+class BuildOptions:
+    """Settings that change generated bytes; they are hashed into each page's manifest entry."""
+
+    minify: bool = False
+    lazy_details: bool = False
+    # (original, fingerprinted) asset paths rewritten in the page shell by --fingerprint.
+    assets: tuple[tuple[str, str], ...] = ()
+    # sha256 of CRITICAL_CSS_SOURCE when --critical-css is on, so stylesheet edits dirty every page.
+    critical_css: str = ""
+
+
+def lazy_outputs(filename: str) -> tuple[str, str]:
+    """The JSON shard and full-HTML fallback written beside a lazily rendered page."""
+    stem = os.path.splitext(filename)[0]
+    return f"{stem}.cards.json", f"{stem}.full.html"
+
+
+def page_outputs(spec: dict, options: BuildOptions) -> list[str]:
+    if options.lazy_details:
+        return [spec["filename"], *lazy_outputs(spec["filename"])]
+    return [spec["filename"]]
+
+
+def write_page(path: str, fragments, options: BuildOptions) -> tuple[int, int] | None:
+    """Write a page, minifying it if asked; returns (bytes before, bytes after) for minified pages."""
+    if not options.minify:
+        write_atomic(path, fragments)
+        return None
+    html = "".join(fragments)
+    minified = minify_html(html)
+    write_atomic(path, [minified])
+    return len(html.encode("utf-8")), len(minified.encode("utf-8"))
+
+
+class PageProfile:
+    """Per-page timings for --profile.
+
+    Fragments are materialized before writing so rendering and file I/O can be
+    timed apart; card calls are timed through a wrapper. Finer detail, such as
+    time spent in escape(), is left to --cprofile. None of this runs unless
+    profiling is on.
+    """
+
+    def __init__(self):
+        self.timings: dict[str, float] = defaultdict(float)
+        self.cards = 0
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] += time.perf_counter() - started
+
+    def wrap_card(self, render):
+        def timed_card(*args):
+            started = time.perf_counter()
+            try:
+                return render(*args)
+            finally:
+                self.timings["cards"] += time.perf_counter() - started
+                self.cards += 1
+
+        return timed_card
+
+    def render(self, spec: dict, card=None, head: str = "", shell: PageShell = PAGE_SHELL) -> list[str]:
+        with self.stage("render"):
+            return list(iter_spec(spec, self.wrap_card(card or CARD_CACHE.render), head, shell))
+
+
+def build_page(spec: dict, options: BuildOptions = BuildOptions(), profile: bool = False) -> dict:
+    hits, misses = CARD_CACHE.hits, CARD_CACHE.misses
+    started = time.perf_counter()
+    page_profile = PageProfile() if profile else None
+    result = {"filename": spec["filename"]}
+    shell = page_shell(options.assets, bool(options.critical_css))
+
+    def fragments(card=None, head="", profiled=True):
+        if options.critical_css:
+            head = CRITICAL_CSS_SLOT + head
+        if page_profile is None or not profiled:
+            pieces = iter_spec(spec, card, head, shell)
+        else:
+            pieces = page_profile.render(spec, card, head, shell)
+        if not options.critical_css:
+            return pieces
+        # The inlined rules depend on the whole page, so it is rendered before the head is filled in.
+        html = "".join(pieces)
+        stylesheet = os.path.join(SITE_DIR, CRITICAL_CSS_SOURCE)
+        parsed = stylesheet_rules(stylesheet, options.critical_css)
+        css, rules = critical_css(html, parsed, posixpath.dirname(CRITICAL_CSS_SOURCE))
+        # Lazy pages also render a full fallback; the report is about the page itself.
+        result.setdefault("critical_css_bytes", len(css.encode("utf-8")))
+        result.setdefault("critical_css_rules", rules)
+        return [html.replace(CRITICAL_CSS_SLOT, f"  <style>{css}</style>\n", 1)]
+
+    def write(path, fragments):
+        if page_profile is None:
+            return write_page(path, fragments, options)
+        with page_profile.stage("write"):
+            return write_page(path, fragments, options)
+
+    shard_path, full_path = lazy_outputs(spec["filename"])
+    if options.lazy_details:
+        shard = CardShard(os.path.basename(full_path))
+        head = (
+            f'  <meta name="card-shard" content="{escape(os.path.basename(shard_path))}">\n'
+            f'  <link rel="alternate" type="text/html" href="{escape(os.path.basename(full_path))}"'
+            ' title="All exercise details">\n'
+            f'  <script src="{EXERCISE_SHARDS_SCRIPT}" defer></script>\n'
+        )
+        sizes = write(spec["filename"], fragments(shard.render, head))
+        write(shard_path, [shard.json()])
+        # Crawlers and no-JS visitors get every card body from the full page.
+        # Its render and write are reported as one fallback time, apart from the page's own stages and cards.
+        with page_profile.stage("fallback") if page_profile else contextlib.nullcontext():
+            write_page(full_path, fragments(profiled=False), options)
+    else:
+        sizes = write(spec["filename"], fragments())
+        for stale in (shard_path, full_path, shard_path + ".gz", full_path + ".gz"):
+            if os.path.exists(stale):
+                os.remove(stale)
+    if sizes:
+        result["bytes_before"], result["bytes_after"] = sizes
+    result["card_hits"] = CARD_CACHE.hits - hits
+    result["card_misses"] = CARD_CACHE.misses - misses
+    result["new_cards"] = CARD_CACHE.drain_new()
+    if page_profile is not None:
+        result["profile"] = {
+            "page": spec["filename"],
+            "cards": page_profile.cards,
+            "bytes": sum(os.path.getsize(path) for path in page_outputs(spec, options)),
+            "total_ms": (time.perf_counter() - started) * 1000,
+            **{f"{name}_ms": seconds * 1000 for name, seconds in sorted(page_profile.timings.items())},
+        }
+    return result
+
+
+def init_worker(card_cache_path: str | None, code_hash: str) -> None:
+    if card_cache_path:
+        CARD_CACHE.load(card_cache_path, code_hash)
+        CARD_CACHE.track_new = True
+
+
+def build_pages(
+    specs: list[dict],
+    jobs: int,
+    options: BuildOptions = BuildOptions(),
+    card_cache_path: str | None = None,
+    code_hash: str = "",
+    profile: bool = False,
+):
+    """Render and write pages, yielding build results in order; jobs > 1 uses a process pool."""
+    if jobs <= 1 or len(specs) <= 1:
+        for spec in specs:
+            yield build_page(spec, options, profile)
+        return
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(specs)),
+        initializer=init_worker,
+        initargs=(card_cache_path, code_hash),
+    ) as pool:
+        for result in pool.map(functools.partial(build_page, options=options, profile=profile), specs):
+            # Worker caches die with the pool; fold their new cards into ours so they can be persisted.
+            CARD_CACHE.hits += result["card_hits"]
+            CARD_CACHE.misses += result["card_misses"]
+            for key, html in result["new_cards"]:
+                CARD_CACHE.add(key, html)
+            yield result
+
+
+def compress_file(path: str) -> tuple[str, int, int] | None:
+    """Write path.gz at maximum level; returns (path, raw, compressed) or None if already current."""
+    target = path + ".gz"
+    try:
+        if os.stat(target).st_mtime >= os.stat(path).st_mtime:
+            return None
+    except FileNotFoundError:
+        pass
+    with open(path, "rb") as f:
+        data = f.read()
+    packed = gzip.compress(data, compresslevel=9, mtime=0)
+    write_atomic(target, [packed], binary=True)
+    return path, len(data), len(packed)
+
+
+def compressible_outputs(filenames: list[str]) -> list[str]:
+    """filenames plus the CSS under assets/ and the scripts under js/, each once."""
+    assets = glob.glob(os.path.join("assets", "**", "*.css"), recursive=True)
+    scripts = glob.glob(os.path.join("js", "**", "*.js"), recursive=True)
+    return list(dict.fromkeys([*filenames, *sorted(assets), *sorted(scripts)]))
+
+
+def compress_outputs(paths: list[str], jobs: int) -> tuple[list[tuple[str, int, int]], int]:
+    """Gzip paths in a thread pool; returns the compressed results and the up-to-date count."""
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        results = list(pool.map(compress_file, paths))
+    done = [result for result in results if result is not None]
+    return done, len(results) - len(done)
+
+
+SEARCH_INDEX_FILE = "search-index.json"
+SEARCH_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def search_tokens(text: str) -> set[str]:
+    # Must match tokenize() in js/exercise-search.js.
+    return {token for token in SEARCH_TOKEN.findall(text.lower()) if len(token) > 1 or token.isdigit()}
+
+
+def build_search_index(specs: list[dict]) -> dict:
+    """Inverted index over every card: token -> sorted doc ids, doc id -> [page, name, primary, equipment].
+
+    Pages, primaries and equipment repeat across cards, so docs refer to them
+    by position in the "pages"/"primaries"/"equipment" lists.
+    """
+    tables: dict[str, list[str]] = {"pages": [], "primaries": [], "equipment": []}
+    positions: dict[tuple[str, str], int] = {}
+
+    def intern(table: str, value: str) -> int:
+        key = (table, value)
+        if key not in positions:
+            positions[key] = len(tables[table])
+            tables[table].append(value)
+        return positions[key]
+
+    docs = []
+    terms: dict[str, list[int]] = {}
+    for spec in specs:
+        title = page_title(spec)
+        page = intern("pages", spec["filename"])
+        for name, primary, _, equipment in iter_exercises(spec):
+            doc_id = len(docs)
+            docs.append([page, name, intern("primaries", primary), intern("equipment", equipment)])
+            for token in search_tokens(f"{name} {primary} {equipment} {title}"):
+                terms.setdefault(token, []).append(doc_id)
+    return {"version": 1, **tables, "docs": docs, "terms": dict(sorted(terms.items()))}
+
+
+def write_search_index(path: str, specs: list[dict]) -> tuple[int, int, int, bool]:
+    """Write the index if it changed; returns (docs, terms, bytes, written)."""
+    index = build_search_index(specs)
+    payload = json.dumps(index, ensure_ascii=False, separators=(",", ":")) + "\n"
+    try:
+        with open(path, encoding="utf-8") as f:
+            unchanged = f.read() == payload
+    except OSError:
+        unchanged = False
+    if not unchanged:
+        write_atomic(path, [payload])
+    return len(index["docs"]), len(index["terms"]), len(payload.encode("utf-8")), not unchanged
+
+
+DEPLOY_MANIFEST_FILE = ".deploy-manifest.json"
+DEPLOY_DELTA_FILE = ".deploy-delta.json"
+
+
+def deploy_entries(paths: list[str], previous: dict) -> dict[str, dict]:
+    """Map each existing path -> {sha256, size, mtime_ns}; files whose size and mtime are unchanged are not re-read."""
+    entries = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        old = previous.get(path)
+        if old and old["size"] == stat.st_size and old["mtime_ns"] == stat.st_mtime_ns:
+            entries[path] = old
+            continue
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(WRITE_BUFFER_SIZE):
+                digest.update(chunk)
+        entries[path] = {"sha256": digest.hexdigest(), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    return entries
+
+
+def diff_deploy(old: dict[str, dict], new: dict[str, dict]) -> dict:
+    """Files to upload (added, changed) and delete (removed) to turn a remote holding old into new."""
+
+    def upload(path):
+        return {"path": path, "sha256": new[path]["sha256"], "size": new[path]["size"]}
+
+    return {
+        "added": [upload(path) for path in sorted(new.keys() - old.keys())],
+        "changed": [upload(path) for path in sorted(new.keys() & old.keys()) if new[path]["sha256"] != old[path]["sha256"]],
+        "removed": sorted(old.keys() - new.keys()),
+        "unchanged": sum(1 for path in new.keys() & old.keys() if new[path]["sha256"] == old[path]["sha256"]),
+    }
+
+
+def write_deploy_manifest(paths: list[str], owner: str = "pages") -> tuple[dict[str, dict], dict]:
+    """Record the output directory's files with their hashes and diff them against the previous build's.
+
+    paths are the files this build owns, under owner ("pages" or "stream"), plus
+    their precompressed siblings. Files other owners recorded earlier stay in the
+    manifest while they exist, so a stream build does not delete the spec-built
+    pages from the remote, or the other way round.
+    Returns (entries, delta); the delta is also written to DEPLOY_DELTA_FILE for sync scripts.
+    """
+    manifest = load_manifest(DEPLOY_MANIFEST_FILE)
+    previous = manifest.get("files", {})
+    paths = [path for path in paths if os.path.exists(path)]
+    # Only siblings of owned files: hand-maintained js/main.js.gz and the like belong with their sources.
+    paths += [path + ".gz" for path in paths if os.path.exists(path + ".gz")]
+    owners = {name: [path for path in owned if os.path.exists(path)] for name, owned in manifest.get("owners", {}).items()}
+    owners[owner] = list(dict.fromkeys(paths))
+    entries = deploy_entries(list(dict.fromkeys(path for owned in owners.values() for path in owned)), previous)
+    delta = diff_deploy(previous, entries)
+    save_manifest(DEPLOY_MANIFEST_FILE, {"files": entries, "owners": owners})
+    write_atomic(DEPLOY_DELTA_FILE, [json.dumps(delta, indent=2), "\n"])
+    return entries, delta
+
+
+def sync_to(target: str, entries: dict[str, dict]) -> dict:
+    """Mirror entries into a local directory standing in for the remote, copying only what its manifest lacks.
+
+    The target keeps its own DEPLOY_MANIFEST_FILE, so a missed sync is caught up on the next one.
+    """
+    remote_manifest = os.path.join(target, DEPLOY_MANIFEST_FILE)
+    delta = diff_deploy(load_manifest(remote_manifest).get("files", {}), entries)
+    for upload in delta["added"] + delta["changed"]:
+        destination = os.path.join(target, upload["path"])
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        with open(upload["path"], "rb") as f:
+            write_atomic(destination, iter(lambda: f.read(WRITE_BUFFER_SIZE), b""), binary=True)
+    for path in delta["removed"]:
+        try:
+            os.remove(os.path.join(target, path))
+        except FileNotFoundError:
+            pass
+    save_manifest(remote_manifest, {"files": entries})
+    return delta
+
+
+PAGE_WEIGHT_FILE = ".page-weight.json"
+# Default per-page limits for --budget; a --budget-file can override them for all pages or per page id.
+PAGE_BUDGETS = {
+    "raw_bytes": 120_000,
+    "gzip_bytes": 8_000,
+    "cards": 60,
+    "dom_nodes": 2_000,
+    "requests": 6,
+}
+PAGE_CARD = re.compile(r'<article class="exercise-card"')
+# Tags whose URL the browser fetches while loading the page; preconnect hints and lazy card shards are not counted.
+PAGE_RESOURCE = re.compile(r"<(link|script|img|iframe|source|video|audio|embed)\b([^>]*)>", re.I)
+HTML_ATTRIBUTE = re.compile(r'([\w-]+)="([^"]*)"')
+FETCHED_LINK_RELS = {"stylesheet", "preload", "modulepreload", "icon"}
+
+
+def page_resources(html: str) -> list[str]:
+    """Distinct URLs of the stylesheets, scripts and media a page loads, in document order."""
+    urls = []
+    for tag, attributes in PAGE_RESOURCE.findall(html):
+        attrs = dict(HTML_ATTRIBUTE.findall(attributes))
+        if tag.lower() == "link":
+            url = attrs.get("href") if FETCHED_LINK_RELS & set(attrs.get("rel", "").split()) else None
+        else:
+            url = attrs.get("src")
+        if url and url not in urls:
+            urls.append(url)
+    return urls
+
+
+def page_weight(path: str) -> dict:
+    with open(path, "rb") as f:
+        data = f.read()
+    html = data.decode("utf-8")
+    # Script and style bodies are text, not elements; comments are not elements either.
+    elements = HTML_COMMENT.sub("", RAW_TEXT_BLOCK.sub(r"<\1>", html))
+    resources = page_resources(html)
+    return {
+        "raw_bytes": len(data),
+        "gzip_bytes": len(gzip.compress(data, compresslevel=9, mtime=0)),
+        "cards": len(PAGE_CARD.findall(html)),
+        "dom_nodes": len(PAGE_TAG.findall(elements)),
+        "requests": len(resources),
+        "resources": resources,
+    }
+
+
+def section_weights(spec: dict) -> list[dict]:
+    """Cards and full card bytes per section of a page, used to name the section behind a page's growth."""
+    return [
         {
-            "name": name,
-            "default_primary": "Abdominals and core stabilizers",
-            "default_secondary": "Hip flexors, obliques, lower back",
-            "equipment": equip_infer(name),
+            "title": title,
+            "cards": len(cards),
+            "bytes": sum(len(CARD_CACHE.render(*card).encode("utf-8")) for card in cards),
         }
-        for name in exercises
+        for title, cards in iter_sections(spec)
     ]
-    return page_html(title, intro, ex_dicts)
 
 
-def main():
-    groups = [
-        {
-            "filename": "chest.html",
-            "title": "Chest Training",
-            "intro": [
-                "Pressing and fly variations that target the pectorals for strength, size, and shoulder stability.",
-                "Mix horizontal and angled presses with flyes and push-ups to train the chest through full ranges.",
-            ],
-            "default_primary": "Pectoralis major",
-            "default_secondary": "Triceps, anterior deltoids",
-            "exercises": [
-                # Barbell presses
-                "Bench Press",
-                "Incline Bench Press",
-                "Decline Bench Press",
-                "Barbell Bench Press With Bands",
-                "Barbell Floor Press",
-                "Reverse-Grip Bench Press",
-                "Smith Machine Flat Bench Press",
-                "Smith Machine Incline Bench Press",
-                "Smith Machine Decline Bench Press",
-                "One-Arm Smith Machine Bench Press",
-                "One-Arm Smith Machine Negative Bench Press",
-                "Smith Machine Bench Press Throw",
-                "Smith Machine Reverse-Grip Bench Press",
-                # Dumbbell presses
-                "Dumbbell Bench Press",
-                "Incline Dumbbell Press",
-                "Decline Dumbbell Press",
-                "One-Arm Dumbbell Bench Press",
-                "Exercise-Ball Dumbbell Press",
-                "Neutral-Grip Flat Bench Dumbbell Press",
-                "Reverse-Grip Dumbbell Press",
-                # Machine / cable / band presses
-                "Seated Chest Press Machine",
-                "One-Arm Cable Chest Press",
-                "Cable Crossover Chest Press",
-                "Cable Crossover Chest Press (From Low Pulleys)",
-                "Cable Bench Press",
-                "Standing Band Chest Press",
-                # Fly variations
-                "Dumbbell Fly",
-                "Incline Dumbbell Fly",
-                "Decline Dumbbell Fly",
-                "Exercise-Ball Dumbbell Fly",
-                "Leaning One-Arm Dumbbell Fly",
-                "Cable Fly",
-                "Cable Crossover",
-                "Low-Pulley Cable Crossover",
-                "Fly Machine",
-                "One-Arm Standing Band Fly",
-                "TRX Fly",
-                # Push-up / dip / pullover
-                "Push-Up",
-                "Incline Push-Up",
-                "Decline Push-Up",
-                "Exercise-Ball Push-Up",
-                "Power Push-Up",
-                "Push-Up Ladder",
-                "TRX Push-Up",
-                "Chest Dip",
-                "Dumbbell Pullover",
-            ],
-        },
-        {
-            "filename": "shoulders.html",
-            "title": "Shoulder Training",
-            "intro": [
-                "Presses, raises, and pulls that build the anterior, middle, and posterior deltoids for balanced strength.",
-                "Mix vertical presses with front, lateral, and rear-delt work to keep shoulders strong and resilient.",
-            ],
-            "default_primary": "Deltoids",
-            "default_secondary": "Triceps, upper traps, rotator cuff",
-            "exercises": [
-                # Barbell / Smith Presses
-                "Standing Barbell Overhead Press (Military Press)",
-                "Seated Barbell Shoulder Press",
-                "Behind-the-Neck Barbell Shoulder Press",
-                "Smith Machine Shoulder Press",
-                "Smith Machine Behind-the-Neck Press",
-                "Barbell Push Press",
-                # Dumbbell Presses
-                "Seated Dumbbell Shoulder Press",
-                "Standing Dumbbell Shoulder Press",
-                "Arnold Press",
-                "Neutral-Grip Dumbbell Shoulder Press",
-                "One-Arm Dumbbell Shoulder Press",
-                "Exercise-Ball Dumbbell Shoulder Press",
-                # Front Raises
-                "Dumbbell Front Raise",
-                "Barbell Front Raise",
-                "Plate Front Raise",
-                "Cable Front Raise",
-                "Single-Arm Cable Front Raise",
-                "Band Front Raise",
-                # Lateral Raises
-                "Dumbbell Lateral Raise",
-                "Seated Dumbbell Lateral Raise",
-                "Leaning One-Arm Dumbbell Lateral Raise",
-                "Cable Lateral Raise",
-                "Low-Pulley Cable Lateral Raise",
-                "Machine Lateral Raise",
-                "Band Lateral Raise",
-                # Rear Delt
-                "Bent-Over Reverse Dumbbell Fly",
-                "Reverse Pec-Deck Machine",
-                "Cable Rear-Delt Fly",
-                "Face Pull",
-                "Incline Bench Reverse Dumbbell Fly",
-                "Band Pull-Apart",
-                "TRX Rear-Delt Fly",
-                # Upright Rows
-                "Barbell Upright Row",
-                "EZ-Bar Upright Row",
-                "Dumbbell Upright Row",
-                "Cable Upright Row",
-            ],
-        },
-        {
-            "filename": "back.html",
-            "title": "Back Training",
-            "intro": [
-                "Rows, pulls, and hinges to build lats, traps, and spinal erectors for a strong, stable back.",
-                "Combine horizontal and vertical pulls with hip hinges for balanced development.",
-            ],
-            "default_primary": "Lats and upper back",
-            "default_secondary": "Biceps, rear delts, forearms, spinal erectors",
-            "exercises": [
-                # Barbell Rows
-                "Barbell Bent-Over Row",
-                "Reverse-Grip Barbell Row",
-                "Yates Row",
-                "T-Bar Row",
-                "Landmine Row",
-                "Smith Machine Bent-Over Row",
-                # Dumbbell Rows
-                "One-Arm Dumbbell Row",
-                "Two-Arm Dumbbell Row",
-                "Chest-Supported Dumbbell Row",
-                "Incline Dumbbell Row",
-                "Dumbbell Seal Row",
-                # Cable / Machine Rows
-                "Seated Cable Row",
-                "Wide-Grip Cable Row",
-                "Close-Grip V-Bar Cable Row",
-                "One-Arm Cable Row",
-                "Hammer Strength Row Machine",
-                "Low-Pulley Row",
-                # Vertical Pulls
-                "Pull-Up (Wide Grip)",
-                "Neutral-Grip Pull-Up",
-                "Chin-Up",
-                "Close-Grip Chin-Up",
-                "Assisted Pull-Up",
-                "Wide-Grip Lat Pulldown",
-                "Reverse-Grip Lat Pulldown",
-                "Close-Grip Lat Pulldown",
-                "Single-Arm Lat Pulldown",
-                # Trap-Focused
-                "Barbell Shrug",
-                "Dumbbell Shrug",
-                "Smith Machine Shrug",
-                "Behind-the-Back Barbell Shrug",
-                "Cable Shrug",
-                "Trap Bar Shrug",
-                # Lower Back
-                "Conventional Deadlift",
-                "Romanian Deadlift",
-                "Stiff-Leg Deadlift",
-                "Good Morning",
-                "Back Extension (Hyperextension)",
-                "45-Degree Back Raise",
-                "Rack Pull",
-                # Lat Isolation
-                "Straight-Arm Lat Pulldown",
-                "Rope Straight-Arm Pulldown",
-                "Single-Arm Straight-Arm Pulldown",
-                "Dumbbell Pullover",
-            ],
-        },
-        {
-            "filename": "biceps.html",
-            "title": "Biceps Training",
-            "intro": [
-                "Curl variations that target elbow flexion and forearm supination for fuller, stronger arms.",
-                "Blend free weights, cables, and preacher positions to challenge the biceps through every angle.",
-            ],
-            "default_primary": "Biceps brachii",
-            "default_secondary": "Brachialis, forearms",
-            "exercises": [
-                # Barbell / EZ-Bar
-                "Standing Barbell Curl",
-                "Wide-Grip Barbell Curl",
-                "Close-Grip Barbell Curl",
-                "EZ-Bar Curl",
-                "Reverse-Grip Barbell Curl",
-                "Barbell Drag Curl",
-                "Strict Curl (Back Against Wall)",
-                # Dumbbells
-                "Standing Dumbbell Curl",
-                "Alternating Dumbbell Curl",
-                "Seated Dumbbell Curl",
-                "Incline Dumbbell Curl",
-                "Hammer Curl",
-                "Cross-Body Hammer Curl",
-                "Zottman Curl",
-                "Supinating Dumbbell Curl",
-                # Preacher / Spider
-                "Barbell Preacher Curl",
-                "EZ-Bar Preacher Curl",
-                "Dumbbell Preacher Curl",
-                "Single-Arm Dumbbell Preacher Curl",
-                "Machine Preacher Curl",
-                "Spider Curl",
-                # Cable
-                "Standing Cable Curl (Straight Bar)",
-                "Rope Cable Curl",
-                "Single-Arm Cable Curl",
-                "High Cable Curl (Double Arm)",
-                "Single-Arm High Cable Curl",
-                # Concentration
-                "Seated Concentration Curl",
-                "Standing Concentration Curl",
-            ],
-        },
-        {
-            "filename": "triceps.html",
-            "title": "Triceps Training",
-            "intro": [
-                "Extensions, press-downs, and dips to build strong triceps for pressing power and arm size.",
-                "Train through overhead, lying, and press-down positions for complete triceps development.",
-            ],
-            "default_primary": "Triceps brachii",
-            "default_secondary": "Forearms, shoulders",
-            "exercises": [
-                # Barbell / EZ-Bar Extensions
-                "Lying Barbell Triceps Extension (Skullcrusher)",
-                "EZ-Bar Skullcrusher",
-                "Incline Skullcrusher",
-                "Decline Skullcrusher",
-                "Seated Barbell French Press",
-                "Seated EZ-Bar French Press",
-                "Barbell JM Press",
-                # Dumbbell Extensions
-                "Lying Dumbbell Triceps Extension",
-                "Seated Overhead Dumbbell Extension",
-                "One-Arm Overhead Dumbbell Extension",
-                "Incline Dumbbell Triceps Extension",
-                "Decline Dumbbell Triceps Extension",
-                "Tate Press (Cross-Body Extension)",
-                # Cable Extensions
-                "Cable Overhead Triceps Extension (Rope)",
-                "Single-Arm Cable Overhead Extension",
-                "Cable Lying Triceps Extension",
-                "Reverse-Grip Cable Extension",
-                "Kneeling Cable Overhead Extension",
-                # Press-Downs
-                "Rope Press-Down",
-                "Straight-Bar Press-Down",
-                "V-Bar Press-Down",
-                "Reverse-Grip Press-Down",
-                "Single-Arm Press-Down",
-                # Dips & Close-Grip
-                "Parallel Bar Triceps Dip",
-                "Bench Dip",
-                "Machine Assisted Dip",
-                "Close-Grip Bench Press",
-                "Diamond Push-Up",
-                # Kickbacks
-                "Dumbbell Kickback",
-                "Cable Kickback",
-            ],
-        },
-        {
-            "filename": "forearms.html",
-            "title": "Forearm Training",
-            "intro": [
-                "Wrist curls, holds, and grip work to develop stronger forearms and resilient elbows.",
-                "Train flexion, extension, and carries for balanced forearm strength.",
-            ],
-            "default_primary": "Forearm flexors and extensors",
-            "default_secondary": "Grip muscles, brachioradialis",
-            "exercises": [
-                "Barbell Wrist Curl",
-                "Barbell Reverse Wrist Curl",
-                "Dumbbell Wrist Curl",
-                "Dumbbell Reverse Wrist Curl",
-                "Behind-the-Back Barbell Wrist Curl",
-                "Reverse Curl (EZ-Bar or Barbell)",
-                "Hammer Curl",
-                "Farmer’s Walk",
-                "Plate Pinch Hold",
-                "Towel Grip Pull-Up (Forearm Focus)",
-            ],
-        },
+def load_budgets(path: str | None) -> tuple[dict[str, int], dict[str, dict[str, int]]]:
+    """Default limits and per-page overrides.
+
+    The TOML file has an optional [default] table and [pages.<id>] tables,
+    each setting any of the PAGE_BUDGETS keys, e.g. [pages.chest] raw_bytes = 100000.
+    Raises ValueError for unknown metrics or page ids and for limits that are not whole numbers.
+    """
+    default, pages = dict(PAGE_BUDGETS), {}
+    if path:
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+        extra = sorted(data.keys() - {"default", "pages"})
+        if extra:
+            raise ValueError(f"unexpected key(s) {', '.join(extra)}; limits go in [default] or [pages.<id>]")
+        pages = data.get("pages", {})
+        if not isinstance(pages, dict):
+            raise ValueError("pages must hold one [pages.<id>] table per page")
+        tables = {"default": data.get("default", {})}
+        tables.update((f"pages.{page}", table) for page, table in pages.items())
+        for name, table in tables.items():
+            if not isinstance(table, dict):
+                raise ValueError(f"{name} must be a table of limits")
+            for metric, limit in table.items():
+                if metric not in PAGE_BUDGETS:
+                    raise ValueError(f"unknown budget metric {name}.{metric}; choose from {', '.join(PAGE_BUDGETS)}")
+                # bool is an int subclass, but "cards = true" is not a limit.
+                if type(limit) is not int or limit < 0:
+                    raise ValueError(f"{name}.{metric} must be a non-negative integer, not {limit!r}")
+        default.update(tables["default"])
+        known = page_registry()
+        unknown = [page for page in pages if page not in known]
+        if unknown:
+            raise ValueError(f"unknown page id(s) {', '.join(unknown)}; choose from {', '.join(known)}")
+    return default, pages
+
+
+def growth_section(sections: list[dict], previous: list[dict]) -> str:
+    """Name the section whose cards grew the most since the previous report, or the heaviest one."""
+    before = {section["title"]: section for section in previous}
+    growth = [
+        (section["bytes"] - before.get(section["title"], {}).get("bytes", 0), section)
+        for section in sections
     ]
+    grown, section = max(growth, key=lambda item: item[0], default=(0, None))
+    if section is None:
+        return ""
+    if previous and grown > 0:
+        cards = section["cards"] - before.get(section["title"], {}).get("cards", 0)
+        return f'{section["title"]} grew by {cards:+} card(s), {grown:+,} bytes'
+    section = max(sections, key=lambda item: item["bytes"])
+    return f'{section["title"]} is the largest section ({section["cards"]} cards, {section["bytes"]:,} bytes)'
+
+
+def check_page_budgets(specs: list[dict], default: dict[str, int], overrides: dict[str, dict[str, int]]) -> dict:
+    """Measure every generated page against its limits.
 
-    for group in groups:
-        ex_dicts = [
-            {
-                "name": name,
-                "default_primary": group["default_primary"],
-                "default_secondary": group["default_secondary"],
-                "equipment": None,
+    An over-budget page is compared with its last within-budget sections, saved as "baseline",
+    so a repeated failing build still names the section that pushed the page over.
+    """
+    previous = load_manifest(PAGE_WEIGHT_FILE).get("pages", {})
+    report = {}
+    for spec in specs:
+        filename = spec["filename"]
+        if not os.path.exists(filename):
+            continue
+        limits = dict(default, **overrides.get(page_id(spec), {}))
+        weight = page_weight(filename)
+        sections = section_weights(spec)
+        over = [f"{metric} {weight[metric]:,} > {limit:,}" for metric, limit in limits.items() if weight[metric] > limit]
+        baseline = previous.get(filename, {}).get("baseline", []) if over else sections
+        weight.update(budget=limits, over=over, sections=sections, baseline=baseline)
+        if over:
+            weight["cause"] = growth_section(sections, baseline)
+        report[filename] = weight
+    save_manifest(PAGE_WEIGHT_FILE, {"pages": report})
+    return report
+
+
+def budget_table(report: dict) -> str:
+    lines = [f"{'Page':<22}{'raw':>10}{'gzip':>9}{'cards':>7}{'DOM':>7}{'requests':>10}  status"]
+    for filename, weight in report.items():
+        status = "over: " + "; ".join(weight["over"]) if weight["over"] else "ok"
+        lines.append(
+            f"{filename:<22}{weight['raw_bytes']:>10,}{weight['gzip_bytes']:>9,}{weight['cards']:>7}"
+            f"{weight['dom_nodes']:>7}{weight['requests']:>10}  {status}"
+        )
+        if weight["over"]:
+            lines.append(f"{'':<22}  cause: {weight['cause']}")
+    return "\n".join(lines)
+
+
+STREAM_PAGE_SIZE = 200
+STREAM_PAGE = re.compile(r"-(\d+)\.html")
+
+
+class StreamRecordError(ValueError):
+    """A --stream input line that is not valid JSON or not a valid record; the message starts with file:line."""
+
+
+STREAM_GROUP_FIELDS = ("filename", "title", "default_primary", "default_secondary")
+STREAM_EXERCISE_OPTIONAL = ("primary", "secondary", "equipment")
+
+
+def iter_jsonl(path: str):
+    """Yield (line number, value) for each non-blank line of a JSON Lines file, reading lazily."""
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if line.strip():
+                try:
+                    yield number, json.loads(line)
+                except ValueError as e:
+                    raise StreamRecordError(f"{path}:{number}: {e}") from None
+
+
+def stream_record_problem(record, in_group: bool) -> str | None:
+    if not isinstance(record, dict):
+        return "expected a JSON object"
+    if "group" in record:
+        group = record["group"]
+        if not isinstance(group, dict):
+            return '"group" must be an object'
+        missing = [field for field in STREAM_GROUP_FIELDS if not isinstance(group.get(field), str)]
+        if missing:
+            return f"group needs string field(s) {', '.join(missing)}"
+        filename = group["filename"]
+        # Pages are written into the output root: pager links and the shell's asset paths assume it.
+        if os.path.basename(filename) != filename or "\\" in filename or not filename.endswith(".html"):
+            return f"group filename must be a plain .html file name, not {filename!r}"
+        intro = group.get("intro", [])
+        if not isinstance(intro, list) or not all(isinstance(p, str) for p in intro):
+            return 'group "intro" must be a list of strings'
+        return None
+    if not in_group:
+        return "exercise record before any group"
+    if not isinstance(record.get("name"), str):
+        return 'exercise needs a string "name"'
+    wrong = [field for field in STREAM_EXERCISE_OPTIONAL if not isinstance(record.get(field), (str, type(None)))]
+    if wrong:
+        return f"exercise field(s) {', '.join(wrong)} must be strings"
+    return None
+
+
+def iter_stream_records(path: str):
+    """Yield the group and exercise records of a --stream file, raising StreamRecordError at the first bad line."""
+    in_group = False
+    for number, record in iter_jsonl(path):
+        problem = stream_record_problem(record, in_group)
+        if problem:
+            raise StreamRecordError(f"{path}:{number}: {problem}")
+        in_group = True
+        yield record
+
+
+def paged_filename(filename: str, number: int) -> str:
+    stem, ext = os.path.splitext(filename)
+    return filename if number == 1 else f"{stem}-{number}{ext}"
+
+
+def pager_html(filename: str, number: int, has_next: bool) -> str:
+    if number == 1 and not has_next:
+        return ""
+    links = ['    <nav class="pagination" aria-label="Exercise pages">\n']
+    if number > 1:
+        href = escape(paged_filename(filename, number - 1))
+        links.append(f'      <a class="button-secondary" href="{href}" rel="prev">Previous</a>\n')
+    links.append(f"      <span>Page {number}</span>\n")
+    if has_next:
+        href = escape(paged_filename(filename, number + 1))
+        links.append(f'      <a class="button" href="{href}" rel="next">Next</a>\n')
+    links.append("    </nav>\n")
+    return "".join(links)
+
+
+class ExerciseStream:
+    """One-record lookahead over a stream of group and exercise records.
+
+    A group record is {"group": {filename, title, intro, default_primary,
+    default_secondary}}; the exercise records after it ({"name", and optionally
+    "primary", "secondary", "equipment"}) belong to it.
+    """
+
+    def __init__(self, records):
+        self._records = iter(records)
+        self._next = next(self._records, None)
+        self.taken = 0
+
+    def next_group(self) -> dict | None:
+        if self._next is None:
+            return None
+        if "group" not in self._next:
+            raise ValueError(f"exercise record before any group: {self._next!r}")
+        group, self._next = self._next["group"], next(self._records, None)
+        return group
+
+    def has_exercise(self) -> bool:
+        return self._next is not None and "group" not in self._next
+
+    def exercises(self, limit: int):
+        """Yield up to limit of the current group's exercises as PageSection exercise dicts."""
+        for _ in range(limit):
+            if not self.has_exercise():
+                return
+            record, self._next = self._next, next(self._records, None)
+            self.taken += 1
+            yield {
+                "name": record["name"],
+                "primary": record.get("primary"),
+                "secondary": record.get("secondary"),
+                "equipment": record.get("equipment"),
             }
-            for name in group["exercises"]
+
+
+def stream_pages(records, page_size: int = STREAM_PAGE_SIZE, shell: PageShell = PAGE_SHELL):
+    """Render groups from an iterator of records, writing each page as its cards arrive.
+
+    Only the current record and one page's output buffer are held, so memory
+    does not grow with the catalog. Yields (filename, cards) per page written.
+    """
+    stream = ExerciseStream(records)
+    while (group := stream.next_group()) is not None:
+        filename, number = group["filename"], 1
+        while True:
+            taken = stream.taken
+            title = group["title"] if number == 1 else f"{group['title']} (Page {number})"
+            section = PageSection(None, group["default_primary"], group["default_secondary"], stream.exercises(page_size))
+            fragments = iter_page(
+                PageModel(group["title"], group.get("intro", []), (section,)),
+                # Called once the page's cards are written, when the lookahead knows if another page follows.
+                pager=lambda: pager_html(filename, number, stream.has_exercise()),
+            )
+            path = paged_filename(filename, number)
+            write_atomic(path, shell.iter_render(fragments, f"TheFitBhaskar.in | {title}"))
+            yield path, stream.taken - taken
+            if not stream.has_exercise():
+                break
+            number += 1
+        remove_stale_pages(filename, number)
+
+
+def remove_stale_pages(filename: str, pages: int) -> None:
+    """Delete continuation pages numbered above pages left by an earlier, longer stream."""
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    directory = os.path.dirname(filename) or "."
+    for other in os.listdir(directory):
+        if other.startswith(stem) and (m := STREAM_PAGE.fullmatch(other[len(stem) :])) and int(m.group(1)) > pages:
+            os.remove(os.path.join(directory, other))
+
+
+def peak_rss_bytes() -> int | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class BuildProfile:
+    """Build-level stage timings plus the per-page records returned by build_page()."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.stages: dict[str, float] = {}
+        self.pages: list[dict] = []
+
+    def stage(self, name: str):
+        return self._timed(name) if self.enabled else contextlib.nullcontext()
+
+    @contextlib.contextmanager
+    def _timed(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+    def page_totals(self) -> dict[str, float]:
+        totals: dict[str, float] = defaultdict(float)
+        for page in self.pages:
+            for key, value in page.items():
+                if key.endswith("_ms") and key != "total_ms":
+                    totals[key[: -len("_ms")]] += value
+        return dict(totals)
+
+    def report(self) -> str:
+        lines = [f"{'Stage':<28}{'ms':>10}"]
+        lines += [f"{name:<28}{ms:>10.2f}" for name, ms in self.stages.items()]
+        lines.append("Summed across pages (worker time):")
+        lines += [f"  {name:<26}{ms:>10.2f}" for name, ms in sorted(self.page_totals().items())]
+        lines.append(f"{'Page':<22}{'cards':>7}{'bytes':>10}{'render':>10}{'cards':>9}{'write':>9}{'total':>9}")
+        for page in self.pages:
+            lines.append(
+                f"{page['page']:<22}{page['cards']:>7}{page['bytes']:>10}"
+                + "".join(f"{page.get(key, 0.0):>{width}.2f}" for key, width in (
+                    ("render_ms", 10), ("cards_ms", 9), ("write_ms", 9), ("total_ms", 9)
+                ))
+            )
+        return "\n".join(lines)
+
+    def to_json(self) -> dict:
+        return {
+            "stages_ms": self.stages,
+            "page_totals_ms": self.page_totals(),
+            "pages": self.pages,
+            "cards": sum(page["cards"] for page in self.pages),
+            "bytes": sum(page["bytes"] for page in self.pages),
+        }
+
+
+def page_ids(value: str) -> list[str]:
+    """Parse --only: comma-separated page ids; "chest.html" is accepted for "chest"."""
+    return [os.path.splitext(part.strip())[0] for part in value.split(",") if part.strip()]
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return number
+
+
+def page_hash(spec: dict, code_hash: str, options: BuildOptions = BuildOptions()) -> str:
+    payload = json.dumps([spec["inputs"], asdict(options)], sort_keys=True, ensure_ascii=False, default=Record.astuple)
+    return hashlib.sha256(f"{code_hash}\n{spec['kind']}\n{payload}".encode("utf-8")).hexdigest()
+
+
+def load_manifest(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(path: str, manifest: dict) -> None:
+    write_atomic(path, [json.dumps(manifest, indent=2, sort_keys=True), "\n"])
+
+
+def build(args: argparse.Namespace, profile: BuildProfile) -> None:
+    assets, stale_assets = {}, []
+    if args.fingerprint:
+        # Copies are written first: their names are baked into every page and its manifest key.
+        with profile.stage("assets"):
+            assets, stale_assets = fingerprint_assets(FINGERPRINTED_ASSETS, write=not args.dry_run)
+    stylesheet_digest = ""
+    if args.critical_css:
+        with open(os.path.join(SITE_DIR, CRITICAL_CSS_SOURCE), "rb") as f:
+            stylesheet_digest = hashlib.sha256(f.read()).hexdigest()
+    options = BuildOptions(
+        minify=args.minify,
+        lazy_details=args.lazy_details,
+        assets=tuple(sorted(assets.items())),
+        critical_css=stylesheet_digest,
+    )
+
+    with profile.stage("plan"):
+        code_hash = generator_fingerprint()
+        # A dry run into a --out directory that does not exist yet has no build state to read.
+        missing_out = args.dry_run and args.out and not os.path.isdir(args.out)
+        if args.card_cache and not missing_out:
+            CARD_CACHE.load(args.card_cache, code_hash)
+        previous = {} if missing_out else load_manifest(MANIFEST_FILE).get("pages", {})
+        # Pages left out by --only keep their manifest entries.
+        pages = dict(previous) if args.only else {}
+        outputs = []
+        dirty, skipped = [], []
+
+        registry = page_registry()
+        specs = list(registry.values())
+        selected = [spec for page, spec in registry.items() if page in args.only] if args.only else specs
+        for spec in selected:
+            filename = spec["filename"]
+            key = page_hash(spec, code_hash, options)
+            pages[filename] = key
+            outputs.extend(page_outputs(spec, options))
+            if not args.force and previous.get(filename) == key and all(map(os.path.exists, page_outputs(spec, options))):
+                skipped.append(filename)
+            else:
+                dirty.append(spec)
+
+    if args.dry_run:
+        into = args.out if missing_out else os.getcwd()
+        if missing_out:
+            print(f"Would create {into}")
+        print(f"Would rebuild {len(dirty)} page(s): {', '.join(spec['filename'] for spec in dirty) or '-'}")
+        print(f"Would skip {len(skipped)} unchanged page(s): {', '.join(skipped) or '-'}")
+        writes = [path for spec in dirty for path in page_outputs(spec, options)]
+        print(f"Would write {len(writes)} page file(s) into {into}: {', '.join(writes) or '-'}")
+        return
+
+    with profile.stage("scripts"):
+        stale_scripts = write_fingerprinted_asset(EXERCISE_CARDS_SCRIPT, EXERCISE_CARDS_JS)
+        if options.lazy_details:
+            stale_scripts += write_fingerprinted_asset(EXERCISE_SHARDS_SCRIPT, EXERCISE_SHARDS_JS)
+    with profile.stage("pages"):
+        results = list(build_pages(dirty, args.jobs, options, args.card_cache, code_hash, profile.enabled))
+    rebuilt = [result["filename"] for result in results]
+    profile.pages = [result["profile"] for result in results if "profile" in result]
+
+    with profile.stage("manifest"):
+        save_manifest(MANIFEST_FILE, {"generator": code_hash, "pages": pages})
+        if args.card_cache and CARD_CACHE.misses:
+            CARD_CACHE.save(args.card_cache, code_hash)
+    print(f"Rebuilt {len(rebuilt)} page(s): {', '.join(rebuilt) or '-'}")
+    print(f"Skipped {len(skipped)} unchanged page(s): {', '.join(skipped) or '-'}")
+    print(f"Card cache: {CARD_CACHE.hits} hit(s), {CARD_CACHE.misses} miss(es)")
+    print(f"Card script: {EXERCISE_CARDS_SCRIPT}" + (f" (removed {', '.join(stale_scripts)})" if stale_scripts else ""))
+    for result in results:
+        if "bytes_before" in result:
+            before, after = result["bytes_before"], result["bytes_after"]
+            print(f"  minify {result['filename']}: {before} -> {after} bytes ({after / before:.1%})")
+    for result in results:
+        if "critical_css_bytes" in result:
+            print(
+                f"  critical css {result['filename']}: {result['critical_css_bytes']} bytes inlined "
+                f"({result['critical_css_rules']} rules)"
+            )
+
+    if args.search_index:
+        started = time.perf_counter()
+        with profile.stage("search index"):
+            docs, terms, size, written = write_search_index(SEARCH_INDEX_FILE, specs)
+        elapsed = (time.perf_counter() - started) * 1000
+        state = "written" if written else "unchanged"
+        print(f"Search index: {SEARCH_INDEX_FILE} {state}, {docs} exercises, {terms} terms, {size} bytes, {elapsed:.1f} ms")
+        outputs.append(SEARCH_INDEX_FILE)
+
+    if args.fingerprint:
+        with profile.stage("headers"):
+            scripts = [EXERCISE_CARDS_SCRIPT] + ([EXERCISE_SHARDS_SCRIPT] if options.lazy_details else [])
+            # Hand-written pages are served from the same directory, so they get short TTLs too.
+            revalidated = ["/"] + sorted(set(outputs) | set(glob.glob("*.html")))
+            write_atomic(HEADERS_FILE, [headers_file(sorted(assets.values()) + scripts, revalidated)])
+            save_manifest(ASSET_MANIFEST_FILE, assets)
+        for original, fingerprinted in assets.items():
+            print(f"  fingerprint {original} -> {fingerprinted}")
+        removed = f", removed {', '.join(stale_assets)}" if stale_assets else ""
+        print(f"Fingerprinted {len(assets)} asset(s); wrote {HEADERS_FILE} and {ASSET_MANIFEST_FILE}{removed}")
+
+    if args.gzip:
+        with profile.stage("gzip"):
+            # Fingerprinted copies such as the root style.<hash>.css sit outside the globbed directories.
+            targets = outputs + sorted(assets.values())
+            compressed, current = compress_outputs(compressible_outputs(targets), args.jobs)
+        for path, raw, packed in compressed:
+            print(f"  gzip {path}: {raw} -> {packed} bytes ({packed / raw:.1%})" if raw else f"  gzip {path}: empty")
+        print(f"Compressed {len(compressed)} file(s), {current} already up to date")
+
+    if args.budget:
+        with profile.stage("budget"):
+            report = check_page_budgets(specs, *load_budgets(args.budget_file))
+        print(budget_table(report))
+        over = [filename for filename, weight in report.items() if weight["over"]]
+        print(f"Page budgets: {len(over)} of {len(report)} page(s) over budget; details in {PAGE_WEIGHT_FILE}")
+        if over and args.budget == "fail":
+            # Nothing is recorded for deploy, so the next build offers the same delta again.
+            sys.exit(f"Page budget exceeded by {', '.join(over)}")
+
+    # Every page the build owns, not just this run's --only selection.
+    owned = [path for spec in specs for path in page_outputs(spec, options)]
+    owned += [EXERCISE_CARDS_SCRIPT] + ([EXERCISE_SHARDS_SCRIPT] if options.lazy_details else [])
+    if args.fingerprint:
+        owned += [*assets.values(), HEADERS_FILE, ASSET_MANIFEST_FILE]
+    if args.search_index:
+        owned.append(SEARCH_INDEX_FILE)
+    deploy(args, profile, owned)
+
+
+def deploy(args: argparse.Namespace, profile: BuildProfile, paths: list[str], owner: str = "pages") -> None:
+    with profile.stage("deploy manifest"):
+        entries, delta = write_deploy_manifest(paths, owner)
+    print(
+        f"Deploy delta: {len(delta['added'])} added, {len(delta['changed'])} changed, "
+        f"{len(delta['removed'])} removed, {delta['unchanged']} unchanged ({DEPLOY_DELTA_FILE})"
+    )
+    if args.sync_to:
+        with profile.stage("sync"):
+            synced = sync_to(args.sync_to, entries)
+        uploaded = synced["added"] + synced["changed"]
+        print(
+            f"Synced {args.sync_to}: uploaded {len(uploaded)} file(s), {sum(u['size'] for u in uploaded)} bytes; "
+            f"removed {len(synced['removed'])}; {synced['unchanged']} unchanged"
+        )
+
+
+def stream_build(args: argparse.Namespace, profile: BuildProfile) -> None:
+    pages = cards = 0
+    outputs = []
+    with profile.stage("stream"):
+        write_fingerprinted_asset(EXERCISE_CARDS_SCRIPT, EXERCISE_CARDS_JS)
+        for path, count in stream_pages(iter_stream_records(args.stream), args.page_size):
+            pages += 1
+            cards += count
+            outputs.append(path)
+    print(f"Streamed {cards} exercise(s) from {args.stream} into {pages} page(s) of at most {args.page_size} cards")
+    peak = peak_rss_bytes()
+    if peak is not None:
+        print(f"Peak RSS: {peak / 2**20:.1f} MiB")
+    if args.gzip:
+        with profile.stage("gzip"):
+            compressed, current = compress_outputs(compressible_outputs(outputs), args.jobs)
+        print(f"Compressed {len(compressed)} file(s), {current} already up to date")
+    deploy(args, profile, [EXERCISE_CARDS_SCRIPT] + outputs, owner="stream")
+
+
+def watched_sources() -> list[str]:
+    """Files whose edits can change generated output: the exercise data, templates and fingerprinted assets."""
+    return [os.path.abspath(__file__), CATALOG_FILE] + [os.path.join(SITE_DIR, path) for path in FINGERPRINTED_ASSETS]
+
+
+def source_snapshot(paths: list[str], previous: dict) -> dict:
+    """Map path -> (mtime_ns, sha256); files whose mtime is unchanged are not re-read."""
+    snapshot = {}
+    for path in paths:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            continue
+        old = previous.get(path)
+        if old and old[0] == mtime:
+            snapshot[path] = old
+            continue
+        with open(path, "rb") as f:
+            snapshot[path] = (mtime, hashlib.sha256(f.read()).hexdigest())
+    return snapshot
+
+
+def build_from_args(args: argparse.Namespace) -> None:
+    profile = BuildProfile(enabled=args.profile or bool(args.profile_json))
+    build(args, profile)
+    if profile.enabled:
+        print(profile.report())
+
+
+def rebuild_in_fresh_process(args: argparse.Namespace) -> bool:
+    # A spawned interpreter re-imports this file, so edited data and templates take effect.
+    process = multiprocessing.get_context("spawn").Process(target=build_from_args, args=(args,))
+    process.start()
+    process.join()
+    return process.exitcode == 0
+
+
+def start_preview_server(port: int) -> ThreadingHTTPServer:
+    handler = functools.partial(SimpleHTTPRequestHandler, directory=os.getcwd())
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Serving {os.getcwd()} at http://127.0.0.1:{server.server_address[1]}/")
+    return server
+
+
+def watch(args: argparse.Namespace) -> None:
+    """Poll the generator's sources and rebuild, through the manifest, whenever one changes."""
+    server = start_preview_server(args.serve) if args.serve is not None else None
+    snapshot = source_snapshot(watched_sources(), {})
+    rebuild_in_fresh_process(args)
+    print(f"Watching {', '.join(os.path.relpath(path) for path in snapshot)} (every {args.poll_interval:g}s, Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(args.poll_interval)
+            current = source_snapshot(watched_sources(), snapshot)
+            changed = [path for path, state in current.items() if snapshot.get(path, (None, None))[1] != state[1]]
+            snapshot = current
+            if not changed:
+                continue
+            started = time.perf_counter()
+            ok = rebuild_in_fresh_process(args)
+            elapsed = (time.perf_counter() - started) * 1000
+            names = ", ".join(os.path.relpath(path) for path in changed)
+            print(f"{'Rebuilt' if ok else 'Build failed'} in {elapsed:.0f} ms after change to {names}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if server is not None:
+            server.shutdown()
+
+
+def main(argv: list[str] | None = None):
+    global CATALOG_CACHE_FILE
+    parser = argparse.ArgumentParser(description="Generate the workout muscle pages.")
+    parser.add_argument(
+        "--out",
+        metavar="DIR",
+        help="write pages, scripts and build state (manifest, caches) into DIR instead of the current directory",
+    )
+    parser.add_argument("--only", type=page_ids, metavar="IDS", help="comma-separated page ids to build, e.g. chest,legs")
+    parser.add_argument("--dry-run", action="store_true", help="print which pages would be rebuilt, writing nothing")
+    parser.add_argument("--force", action="store_true", help="rebuild every page, ignoring the build manifest")
+    parser.add_argument(
+        "--jobs",
+        type=positive_int,
+        default=os.cpu_count() or 1,
+        help="worker processes used to render pages (default: CPU count; 1 renders serially in-process)",
+    )
+    parser.add_argument(
+        "--card-cache",
+        nargs="?",
+        const=CARD_CACHE_FILE,
+        metavar="PATH",
+        help=f"persist rendered cards between builds (default path: {CARD_CACHE_FILE})",
+    )
+    parser.add_argument(
+        "--gzip",
+        action="store_true",
+        help="write precompressed .gz siblings for the pages and the CSS/JS under assets/ and js/",
+    )
+    parser.add_argument("--minify", action="store_true", help="collapse whitespace and strip comments in pages")
+    parser.add_argument(
+        "--lazy-details",
+        action="store_true",
+        help="ship card summaries only and load card bodies from a per-page JSON shard on first open",
+    )
+    parser.add_argument(
+        "--search-index",
+        action="store_true",
+        help=f"write {SEARCH_INDEX_FILE}, the cross-page exercise index used by js/exercise-search.js",
+    )
+    parser.add_argument(
+        "--fingerprint",
+        action="store_true",
+        help=f"write content-hashed copies of {', '.join(FINGERPRINTED_ASSETS)}, point pages at them "
+        f"and write {HEADERS_FILE} cache rules plus {ASSET_MANIFEST_FILE}",
+    )
+    parser.add_argument(
+        "--critical-css",
+        action="store_true",
+        help=f"inline the {CRITICAL_CSS_SOURCE} rules each page uses and load the full stylesheets without blocking",
+    )
+    parser.add_argument(
+        "--stream",
+        metavar="JSONL",
+        help="render groups from a JSON Lines file of group and exercise records, one page at a time in bounded memory",
+    )
+    parser.add_argument(
+        "--page-size",
+        type=positive_int,
+        default=STREAM_PAGE_SIZE,
+        metavar="CARDS",
+        help=f"with --stream, continue a group on a new page after this many cards (default {STREAM_PAGE_SIZE})",
+    )
+    parser.add_argument(
+        "--sync-to",
+        metavar="DIR",
+        help=f"after building, copy only added and changed outputs into DIR and delete removed ones "
+        f"(DIR keeps its own {DEPLOY_MANIFEST_FILE})",
+    )
+    parser.add_argument(
+        "--budget",
+        nargs="?",
+        const="fail",
+        choices=("warn", "fail"),
+        help=f"measure each page's size, gzip size, cards, DOM nodes and requests against its budget "
+        f"and fail (default) or warn when one is exceeded; the report is written to {PAGE_WEIGHT_FILE}",
+    )
+    parser.add_argument(
+        "--budget-file",
+        metavar="PATH",
+        help="TOML file of budget limits: a [default] table and [pages.<id>] overrides (implies --budget)",
+    )
+    parser.add_argument("--profile", action="store_true", help="print per-stage and per-page timings")
+    parser.add_argument("--profile-json", metavar="PATH", help="write the --profile trace as JSON (implies --profile)")
+    parser.add_argument(
+        "--cprofile",
+        metavar="PATH",
+        help="run the build under cProfile and dump stats to PATH (.prof); pool workers are not profiled, use --jobs 1",
+    )
+    parser.add_argument("--watch", action="store_true", help="rebuild changed pages whenever the generator's sources change")
+    parser.add_argument("--poll-interval", type=float, default=0.5, metavar="SECONDS", help="--watch polling interval")
+    parser.add_argument(
+        "--serve",
+        nargs="?",
+        type=int,
+        const=8000,
+        metavar="PORT",
+        help="with --watch, serve the output directory on 127.0.0.1 (default port 8000)",
+    )
+    args = parser.parse_args(argv)
+    if args.critical_css and not os.path.exists(os.path.join(SITE_DIR, CRITICAL_CSS_SOURCE)):
+        parser.error(f"--critical-css needs {CRITICAL_CSS_SOURCE} in {SITE_DIR}")
+    if args.budget_file:
+        args.budget = args.budget or "fail"
+    if args.dry_run and (args.watch or args.sync_to):
+        parser.error("--dry-run cannot be combined with --watch or --sync-to")
+    if args.stream:
+        # These work on whole pages, the whole catalog or the spec build's output list.
+        whole = [
+            "minify", "lazy_details", "critical_css", "search_index", "fingerprint", "watch", "only", "dry_run", "budget"
         ]
-        html = page_html(group["title"], group["intro"], ex_dicts)
-        full = wrap_page(html, f"TheFitBhaskar.in | {group['title']}", active="workout")
-        with open(group["filename"], "w", encoding="utf-8") as f:
-            f.write(full)
+        clashing = [f"--{name.replace('_', '-')}" for name in whole if getattr(args, name)]
+        if clashing:
+            parser.error(f"--stream cannot be combined with {', '.join(clashing)}")
+        if not os.path.isfile(args.stream):
+            parser.error(f"--stream: no such file {args.stream}")
+
+    if args.out:
+        # Paths given on the command line stay relative to where it was run.
+        for name in ("out", "stream", "profile_json", "cprofile", "sync_to", "budget_file"):
+            if getattr(args, name):
+                setattr(args, name, os.path.abspath(getattr(args, name)))
+        if not args.dry_run:
+            os.makedirs(args.out, exist_ok=True)
+            os.chdir(args.out)
+        elif os.path.isdir(args.out):
+            # A dry run only reads DIR's build state, and never creates DIR.
+            os.chdir(args.out)
+    if args.dry_run:
+        # A dry run writes nothing, the catalog cache included.
+        CATALOG_CACHE_FILE = None
+    # Loading the catalog comes after the chdir and the cache setting above.
+    if args.only:
+        known = page_registry()
+        unknown = [page for page in args.only if page not in known]
+        if unknown:
+            parser.error(f"unknown page id(s) {', '.join(unknown)}; choose from {', '.join(known)}")
+    if args.budget:
+        try:
+            load_budgets(args.budget_file)
+        except (OSError, ValueError) as e:
+            parser.error(f"--budget-file: {e}")
+
+    if args.watch:
+        watch(args)
+        return
 
-    with open("legs.html", "w", encoding="utf-8") as f:
-        f.write(wrap_page(legs_page(), "TheFitBhaskar.in | Leg Training", active="workout"))
+    profile = BuildProfile(enabled=args.profile or bool(args.profile_json))
+    profiler = cProfile.Profile() if args.cprofile else None
+    with profile.stage("total"):
+        if profiler is not None:
+            profiler.enable()
+        try:
+            (stream_build if args.stream else build)(args, profile)
+        except StreamRecordError as e:
+            # Pages before the bad line are written; the error names the line to fix.
+            sys.exit(f"{parser.prog}: error: {e}")
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                profiler.dump_stats(args.cprofile)
 
-    with open("abs.html", "w", encoding="utf-8") as f:
-        f.write(wrap_page(abs_page(), "TheFitBhaskar.in | Abs & Core", active="workout"))
+    if profile.enabled:
+        print(profile.report())
+    if args.profile_json:
+        write_atomic(args.profile_json, [json.dumps(profile.to_json(), indent=2), "\n"])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,123 @@
+// exercise-search.js - cross-page exercise search backed by search-index.json
+// The index is built by generate_workouts.py --search-index; the search section stays hidden
+// on sites deployed without it.
+
+(() => {
+  const input = document.querySelector("#exercise-search");
+  const results = document.querySelector("#exercise-search-results");
+  const status = document.querySelector("#exercise-search-status");
+  const section = input && input.closest(".exercise-search");
+  if (!input || !results) return;
+
+  const maxResults = 30;
+  let index = null;
+  let indexPromise = null;
+  let sortedTerms = [];
+
+  // Must match search_tokens() in generate_workouts.py.
+  const tokenize = text =>
+    (text.toLowerCase().match(/[a-z0-9]+/g) || []).filter(token => token.length > 1 || /^\d+$/.test(token));
+
+  const loadIndex = () => {
+    if (indexPromise) return indexPromise;
+    indexPromise = fetch("search-index.json")
+      .then(res => {
+        if (!res.ok) throw new Error(`HTTP ${res.status}`);
+        return res.json();
+      })
+      .then(data => {
+        index = data;
+        sortedTerms = Object.keys(data.terms).sort();
+        return data;
+      })
+      .catch(err => {
+        indexPromise = null;
+        throw err;
+      });
+    return indexPromise;
+  };
+
+  // Doc ids for every term starting with prefix, found by binary search over the sorted terms.
+  const prefixMatches = prefix => {
+    let lo = 0;
+    let hi = sortedTerms.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >> 1;
+      if (sortedTerms[mid] < prefix) lo = mid + 1;
+      else hi = mid;
+    }
+    const ids = new Set();
+    for (let i = lo; i < sortedTerms.length && sortedTerms[i].startsWith(prefix); i++) {
+      index.terms[sortedTerms[i]].forEach(id => ids.add(id));
+    }
+    return ids;
+  };
+
+  const search = query => {
+    const tokens = tokenize(query);
+    if (!tokens.length) return [];
+    let matches = null;
+    tokens.forEach((token, i) => {
+      // The last token may still be being typed, so match it as a prefix.
+      const ids = i === tokens.length - 1 ? prefixMatches(token) : new Set(index.terms[token] || []);
+      matches = matches ? new Set([...matches].filter(id => ids.has(id))) : ids;
+    });
+    return [...matches].sort((a, b) => a - b);
+  };
+
+  const render = ids => {
+    results.innerHTML = "";
+    ids.slice(0, maxResults).forEach(id => {
+      const [page, name, primary, equipment] = index.docs[id];
+      const card = document.createElement("article");
+      card.className = "muscle-card";
+      const title = document.createElement("h2");
+      title.textContent = name;
+      const meta = document.createElement("p");
+      meta.textContent = `${index.primaries[primary]} · ${index.equipment[equipment]}`;
+      const link = document.createElement("a");
+      link.className = "button";
+      link.href = index.pages[page];
+      link.textContent = "View Exercises";
+      card.append(title, meta, link);
+      results.appendChild(card);
+    });
+    results.hidden = !ids.length;
+  };
+
+  const update = async () => {
+    const query = input.value.trim();
+    if (!query) {
+      render([]);
+      if (status) status.textContent = "";
+      return;
+    }
+    try {
+      await loadIndex();
+    } catch (err) {
+      console.error(err);
+      if (status) status.textContent = "Exercise search is unavailable right now.";
+      return;
+    }
+    if (input.value.trim() !== query) return;
+    const ids = search(query);
+    render(ids);
+    if (status) {
+      status.textContent = ids.length
+        ? `Showing ${Math.min(ids.length, maxResults)} of ${ids.length} exercises.`
+        : "No exercises match. Try a different keyword.";
+    }
+  };
+
+  input.addEventListener("focus", () => loadIndex().catch(() => {}), { once: true });
+  input.addEventListener("input", update);
+
+  // Show the search only once the index is known to exist; a HEAD request avoids downloading it up front.
+  if (section && section.hidden) {
+    fetch("search-index.json", { method: "HEAD" })
+      .then(res => {
+        if (res.ok) section.hidden = false;
+      })
+      .catch(() => {});
+  }
+})();
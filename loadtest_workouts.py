@@ -0,0 +1,140 @@
+"""
+Load-test the in-memory render server from serve_workouts.py.
+Starts a server on a free local port (or targets --url), replays page requests from worker threads
+and reports throughput and latency percentiles for plain, gzip and conditional (304) traffic.
+"""
+
+import argparse
+import http.client
+import json
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+import generate_workouts as gw
+import serve_workouts
+
+MODES = ("plain", "gzip", "conditional")
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def fetch(host: str, port: int, path: str, headers: dict) -> tuple[int, bytes, dict]:
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    try:
+        conn.request("GET", path, headers=headers)
+        response = conn.getresponse()
+        return response.status, response.read(), dict(response.getheaders())
+    finally:
+        conn.close()
+
+
+def run_mode(host: str, port: int, paths: list[str], mode: str, requests: int, concurrency: int) -> dict:
+    base = {"Accept-Encoding": "gzip"} if mode in ("gzip", "conditional") else {}
+    etags = {}
+    if mode == "conditional":
+        for path in paths:
+            etags[path] = fetch(host, port, path, base)[2]["ETag"]
+
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    received = 0
+    lock = threading.Lock()
+    counter = iter(range(requests))
+
+    def worker():
+        nonlocal received
+        local_latencies, local_statuses, local_bytes = [], {}, 0
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                break
+            path = paths[i % len(paths)]
+            headers = dict(base, **({"If-None-Match": etags[path]} if mode == "conditional" else {}))
+            started = time.perf_counter()
+            status, body, _ = fetch(host, port, path, headers)
+            local_latencies.append(time.perf_counter() - started)
+            local_statuses[status] = local_statuses.get(status, 0) + 1
+            local_bytes += len(body)
+        with lock:
+            latencies.extend(local_latencies)
+            received += local_bytes
+            for status, count in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + count
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "requests_per_s": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1e3,
+        "p99_ms": percentile(latencies, 0.99) * 1e3,
+        "max_ms": (latencies[-1] if latencies else 0.0) * 1e3,
+        "body_bytes": received,
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the in-memory workout page server.")
+    parser.add_argument("--url", help="target a running server instead of starting one, e.g. http://127.0.0.1:8000")
+    parser.add_argument("--requests", type=gw.positive_int, default=2000, help="requests per mode (default 2000)")
+    parser.add_argument("--concurrency", type=gw.positive_int, default=8, help="client threads (default 8)")
+    parser.add_argument("--modes", default=",".join(MODES), help=f"comma-separated subset of {', '.join(MODES)}")
+    parser.add_argument("--output", metavar="PATH", help="write results as JSON")
+    args = parser.parse_args(argv)
+
+    modes = [mode for mode in args.modes.split(",") if mode]
+    unknown = sorted(set(modes) - set(MODES))
+    if unknown:
+        parser.error(f"unknown mode(s): {', '.join(unknown)}")
+
+    server = None
+    if args.url:
+        target = urlsplit(args.url)
+        host, port = target.hostname, target.port or 80
+    else:
+        server = serve_workouts.create_server(serve_workouts.RenderApp(), port=0, quiet=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host, port = "127.0.0.1", server.server_port
+    paths = ["/" + spec["filename"] for spec in gw.page_specs()]
+
+    results = {"requests": args.requests, "concurrency": args.concurrency, "pages": len(paths), "modes": {}}
+    try:
+        for mode in modes:
+            metrics = run_mode(host, port, paths, mode, args.requests, args.concurrency)
+            results["modes"][mode] = metrics
+            print(
+                f"{mode:<12} {metrics['requests_per_s']:8,.0f} req/s  p50 {metrics['p50_ms']:6.2f} ms  "
+                f"p99 {metrics['p99_ms']:6.2f} ms  {metrics['body_bytes'] / metrics['requests']:8,.0f} B/req  "
+                f"{metrics['statuses']}"
+            )
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""
+Serve the workout pages straight from the generator, rendered on demand and kept in memory.
+Responses carry strong ETags, answer If-None-Match with 304 and are gzip-encoded when accepted.
+"""
+
+import argparse
+import gzip
+import hashlib
+import mimetypes
+import os
+import sys
+import threading
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+import generate_workouts as gw
+
+
+class Resource:
+    """One response body with its strong ETag; the gzip variant is built on first use."""
+
+    __slots__ = ("body", "content_type", "etag", "_gzipped")
+
+    def __init__(self, body: bytes, content_type: str):
+        self.body = body
+        self.content_type = content_type
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        self._gzipped: bytes | None = None
+
+    @property
+    def gzipped(self) -> bytes:
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=9, mtime=0)
+        return self._gzipped
+
+    @property
+    def gzip_etag(self) -> str:
+        # Strong ETags must differ between encodings of the same resource.
+        return self.etag[:-1] + '-gz"'
+
+
+def coding_quality(params: str) -> float:
+    """The q-value among an Accept-Encoding entry's parameters; 1 if absent, 0 if unparsable."""
+    for param in params.split(";"):
+        key, _, value = param.strip().partition("=")
+        if key.strip().lower() == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def accepts_gzip(header: str) -> bool:
+    """Whether the header allows gzip; an explicit gzip entry takes precedence over "*"."""
+    qualities = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        qualities[coding.strip().lower()] = coding_quality(params)
+    quality = qualities.get("gzip", qualities.get("*", 0.0))
+    return quality > 0
+
+
+def etag_matches(header: str, etags: tuple[str, ...]) -> bool:
+    # If-None-Match uses the weak comparison, so W/"x" matches our strong "x".
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in candidates or any(tag in candidates for tag in etags)
+
+
+class RenderApp:
+    """WSGI app rendering generator pages into an in-memory cache and serving other files from root."""
+
+    def __init__(self, root: str = ".", options: gw.BuildOptions = gw.BuildOptions()):
+        self.root = os.path.abspath(root)
+        self.options = options
+        self.specs = {"/" + spec["filename"]: spec for spec in gw.page_specs()}
+        self._generated = {"/" + gw.EXERCISE_CARDS_SCRIPT: gw.EXERCISE_CARDS_JS}
+        self._pages: dict[str, Resource] = {}
+        self._files: dict[str, tuple[int, Resource]] = {}
+        self._lock = threading.Lock()
+
+    def page(self, path: str) -> Resource:
+        resource = self._pages.get(path)
+        if resource is None:
+            html = gw.render_spec(self.specs[path])
+            if self.options.minify:
+                html = gw.minify_html(html)
+            with self._lock:
+                resource = self._pages.setdefault(path, Resource(html.encode("utf-8"), "text/html; charset=utf-8"))
+        return resource
+
+    def static(self, path: str) -> Resource | None:
+        full = os.path.normpath(os.path.join(self.root, path.lstrip("/")))
+        if not full.startswith(self.root + os.sep) or not os.path.isfile(full):
+            return None
+        mtime = os.stat(full).st_mtime_ns
+        cached = self._files.get(full)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        with open(full, "rb") as f:
+            body = f.read()
+        content_type = mimetypes.guess_type(full)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type in ("application/javascript", "application/json"):
+            content_type += "; charset=utf-8"
+        resource = Resource(body, content_type)
+        with self._lock:
+            self._files[full] = (mtime, resource)
+        return resource
+
+    def resolve(self, path: str) -> Resource | None:
+        if path == "/":
+            path = "/index.html"
+        if path in self.specs:
+            return self.page(path)
+        if path in self._generated:
+            with self._lock:
+                if path not in self._pages:
+                    self._pages[path] = Resource(self._generated[path].encode("utf-8"), "text/javascript; charset=utf-8")
+            return self._pages[path]
+        return self.static(path)
+
+    def __call__(self, environ, start_response):
+        method = environ["REQUEST_METHOD"]
+        if method not in ("GET", "HEAD"):
+            start_response("405 Method Not Allowed", [("Allow", "GET, HEAD"), ("Content-Length", "0")])
+            return [b""]
+        resource = self.resolve(environ.get("PATH_INFO") or "/")
+        if resource is None:
+            body = b"Not found\n"
+            start_response("404 Not Found", [("Content-Type", "text/plain"), ("Content-Length", str(len(body)))])
+            return [body if method == "GET" else b""]
+
+        use_gzip = accepts_gzip(environ.get("HTTP_ACCEPT_ENCODING", ""))
+        etag = resource.gzip_etag if use_gzip else resource.etag
+        headers = [("ETag", etag), ("Vary", "Accept-Encoding"), ("Cache-Control", "no-cache")]
+        # Only the validator of the representation this response would carry: a cached gzip body
+        # is not a valid copy of the identity one, or the other way round.
+        if etag_matches(environ.get("HTTP_IF_NONE_MATCH", ""), (etag,)):
+            start_response("304 Not Modified", headers)
+            return [b""]
+
+        body = resource.gzipped if use_gzip else resource.body
+        headers += [("Content-Type", resource.content_type), ("Content-Length", str(len(body)))]
+        if use_gzip:
+            headers.append(("Content-Encoding", "gzip"))
+        start_response("200 OK", headers)
+        return [body if method == "GET" else b""]
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def create_server(app: RenderApp, host: str = "127.0.0.1", port: int = 8000, quiet: bool = False) -> WSGIServer:
+    handler = QuietHandler if quiet else WSGIRequestHandler
+    return make_server(host, port, app, server_class=ThreadingWSGIServer, handler_class=handler)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve the workout pages rendered in memory.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--root", default=".", help="directory for files the generator does not render")
+    parser.add_argument("--minify", action="store_true", help="minify rendered pages")
+    parser.add_argument("--quiet", action="store_true", help="do not log requests")
+    args = parser.parse_args(argv)
+
+    app = RenderApp(args.root, gw.BuildOptions(minify=args.minify))
+    server = create_server(app, args.host, args.port, args.quiet)
+    print(f"Rendering {len(app.specs)} pages on demand at http://{args.host}:{server.server_port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
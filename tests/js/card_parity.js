@@ -0,0 +1,51 @@
+// Replays random clicks on the exercise-card script before and after the rewrite and asserts that
+// both leave the same open <details>, .active-card and .single-focus state after every step.
+// Usage: node card_parity.js BEFORE.js AFTER.js
+const assert = require('assert');
+const stub = require('./dom_stub');
+
+const [before, after] = process.argv.slice(2);
+let seed = 1;
+const random = n => {
+  seed = (seed * 1103515245 + 12345) % 2147483648;
+  return seed % n;
+};
+
+// Each op: click expand-all, collapse-all or a card summary, then maybe deliver the queued toggle events.
+function replay(file, grids, perGrid, ops) {
+  const page = stub.load(file, grids, perGrid);
+  return ops.map(([kind, card, flush]) => {
+    stub.click(kind === 0 ? page.buttons[0] : kind === 1 ? page.buttons[1] : page.summaries[card]);
+    if (flush) stub.flushToggles();
+    return JSON.parse(stub.state(page));
+  });
+}
+
+function compare(grids, perGrid, runs, steps, compareFocus) {
+  for (let run = 0; run < runs; run++) {
+    const ops = Array.from({ length: steps }, () => [random(10), random(grids * perGrid), random(3)]);
+    const expected = replay(before, grids, perGrid, ops);
+    const actual = replay(after, grids, perGrid, ops);
+    expected.forEach((state, step) => {
+      if (!compareFocus) {
+        delete state.focus;
+        delete actual[step].focus;
+      }
+      assert.deepStrictEqual(actual[step], state, `${grids} grid(s), run ${run}, step ${step}`);
+    });
+  }
+}
+
+// A muscle page: one grid, so single-focus must match too.
+compare(1, 49, 40, 60, true);
+// The legs page has one grid per section. The old script always put single-focus on the first grid,
+// so only open state and active-card are compared there...
+compare(4, 8, 40, 60, false);
+// ...and the new one must put it on the clicked card's own grid.
+const legs = stub.load(after, 4, 8);
+stub.click(legs.summaries[20]);
+stub.flushToggles();
+const grids = legs.doc.querySelectorAll('.exercise-grid');
+assert.deepStrictEqual(grids.map(grid => grid.classList.contains('single-focus')), [false, false, true, false]);
+
+console.log('exercise-card script parity: ok');
@@ -0,0 +1,89 @@
+// Minimal DOM stub: enough of Element/Document/events for the exercise-card scripts.
+// click() toggles <details> like a browser, and toggle events are queued until flushToggles(),
+// the way browsers fire them asynchronously.
+const fs = require('fs');
+let visits = 0, toggleQueue = [];
+class ClassList {
+  constructor() { this.s = new Set(); }
+  add(c) { this.s.add(c); } remove(c) { this.s.delete(c); } contains(c) { return this.s.has(c); }
+  toggle(c) { this.s.has(c) ? this.s.delete(c) : this.s.add(c); }
+}
+class El {
+  constructor(tag, cls = [], attrs = {}) {
+    this.tagName = tag.toUpperCase(); this.classList = new ClassList(); cls.forEach(c => this.classList.add(c));
+    this.attrs = { ...attrs }; this.children = []; this.parent = null; this.listeners = {}; this.textContent = '';
+  }
+  append(...cs) { cs.forEach(c => { c.parent = this; this.children.push(c); }); return this; }
+  getAttribute(n) { return n in this.attrs ? this.attrs[n] : null; }
+  setAttribute(n, v) { const was = n in this.attrs; this.attrs[n] = String(v); if (n === 'open' && !was) queueToggle(this); }
+  removeAttribute(n) { const was = n in this.attrs; delete this.attrs[n]; if (n === 'open' && was) queueToggle(this); }
+  get open() { return 'open' in this.attrs; }
+  matchesSimple(sel) {
+    const m = sel.match(/^([a-z]*)((?:\.[\w-]+)*)(\[([\w-]+)\])?$/);
+    if (!m) throw new Error('selector ' + sel);
+    if (m[1] && this.tagName !== m[1].toUpperCase()) return false;
+    for (const c of m[2].split('.').filter(Boolean)) if (!this.classList.contains(c)) return false;
+    if (m[4] && !(m[4] in this.attrs)) return false;
+    return true;
+  }
+  matches(sel) {
+    const parts = sel.trim().split(/\s+/);
+    if (!this.matchesSimple(parts.pop())) return false;
+    let node = this.parent;
+    while (parts.length && node) { if (node.matchesSimple && node.matchesSimple(parts[parts.length - 1])) parts.pop(); node = node.parent; }
+    return !parts.length;
+  }
+  closest(sel) { for (let n = this; n && n.matchesSimple; n = n.parent) { visits++; if (n.matches(sel)) return n; } return null; }
+  *walk() { for (const c of this.children) { visits++; yield c; yield* c.walk(); } }
+  querySelectorAll(sel) { return [...this.walk()].filter(e => e.matches(sel)); }
+  querySelector(sel) { return this.querySelectorAll(sel)[0] || null; }
+  addEventListener(type, fn, capture) { (this.listeners[type + !!capture] ??= []).push(fn); }
+}
+function queueToggle(el) { if (!toggleQueue.includes(el)) toggleQueue.push(el); }
+function dispatch(target, type, bubbles) {
+  const path = []; for (let n = target; n; n = n.parent) path.push(n);
+  const ev = { target, type, defaultPrevented: false, preventDefault() { this.defaultPrevented = true; } };
+  for (const n of [...path].reverse()) (n.listeners[type + true] || []).forEach(f => f(ev));
+  for (const n of (bubbles ? path : [target])) (n.listeners[type + false] || []).forEach(f => f(ev));
+  return ev;
+}
+function flushToggles() { const q = toggleQueue; toggleQueue = []; q.forEach(el => dispatch(el, 'toggle', false)); }
+function click(el) {
+  const ev = dispatch(el, 'click', true);
+  const details = el.tagName === 'SUMMARY' ? el.parent : null;
+  if (details && !ev.defaultPrevented) details.open ? details.removeAttribute('open') : details.setAttribute('open', '');
+}
+function page(grids, perGrid) {
+  const doc = new El('html'); doc.getElementById = id => doc.querySelectorAll('span').find(e => e.attrs.id === id);
+  const actions = new El('div', ['exercise-actions']).append(
+    new El('button', ['button'], { 'data-action': 'expand-all' }), new El('button', ['button-secondary'], { 'data-action': 'collapse-all' }));
+  const main = new El('main').append(actions);
+  const summaries = [];
+  for (let g = 0; g < grids; g++) {
+    const grid = new El('div', ['exercise-grid']);
+    for (let i = 0; i < perGrid; i++) {
+      const summary = new El('summary', ['exercise-toggle']).append(new El('h3'));
+      summaries.push(summary);
+      grid.append(new El('article', ['exercise-card']).append(new El('details').append(summary, new El('div', ['exercise-body']))));
+    }
+    main.append(new El('section', ['muscle-subsection']).append(grid));
+  }
+  doc.append(main, new El('span', [], { id: 'year' }));
+  return { doc, summaries, buttons: actions.children };
+}
+function state(p) {
+  const all = [...p.doc.walk()];
+  return JSON.stringify({
+    open: all.filter(e => e.tagName === 'DETAILS').map(e => +e.open).join(''),
+    active: all.filter(e => e.classList.contains('active-card')).map(e => all.indexOf(e)),
+    focus: all.filter(e => e.classList.contains('single-focus')).map(e => all.indexOf(e)),
+  });
+}
+function load(file, grids, perGrid) {
+  toggleQueue = [];
+  const p = page(grids, perGrid);
+  global.document = p.doc;
+  new Function(fs.readFileSync(file, 'utf8'))();
+  return p;
+}
+module.exports = { load, click, flushToggles, state, visitsReset: () => { const v = visits; visits = 0; return v; } };
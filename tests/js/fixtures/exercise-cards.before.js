@@ -0,0 +1,53 @@
+(() => {
+  const buttons = document.querySelectorAll('[data-action]');
+  const getDetails = () => Array.from(document.querySelectorAll('.exercise-card details'));
+  const getGrid = () => document.querySelector('.exercise-grid');
+  const getCards = () => Array.from(document.querySelectorAll('.exercise-card'));
+  let expandMode = false;
+
+  // Single-open behavior: open one, close others
+  document.addEventListener('click', (e) => {
+    const summary = e.target.closest('summary.exercise-toggle');
+    if (!summary) return;
+    if (expandMode) return; // in expand-all mode, keep standard behavior
+    const currentDetails = summary.closest('details');
+    const currentCard = summary.closest('.exercise-card');
+    const grid = getGrid();
+    // Close others
+    getDetails().forEach((d) => {
+      if (d !== currentDetails) d.removeAttribute('open');
+    });
+    getCards().forEach((c) => c.classList.remove('active-card'));
+    currentCard.classList.add('active-card');
+    grid?.classList.add('single-focus');
+  });
+
+  buttons.forEach((btn) => {
+    btn.addEventListener('click', () => {
+      const act = btn.getAttribute('data-action');
+      if (act === 'expand-all') {
+        getDetails().forEach((d) => d.setAttribute('open', 'true'));
+        expandMode = true;
+        getCards().forEach((c) => c.classList.remove('active-card'));
+        getGrid()?.classList.remove('single-focus');
+      } else if (act === 'collapse-all') {
+        getDetails().forEach((d) => d.removeAttribute('open'));
+        expandMode = false;
+        getCards().forEach((c) => c.classList.remove('active-card'));
+        getGrid()?.classList.remove('single-focus');
+      }
+    });
+  });
+
+  // If user manually closes an open detail, reset single-focus
+  getDetails().forEach((d) => {
+    d.addEventListener('toggle', () => {
+      if (!expandMode && !d.open) {
+        getCards().forEach((c) => c.classList.remove('active-card'));
+        getGrid()?.classList.remove('single-focus');
+      }
+    });
+  });
+})();
+
+document.getElementById("year").textContent = new Date().getFullYear();
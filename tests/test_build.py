@@ -0,0 +1,157 @@
+"""End-to-end builds in scratch directories; main() changes directory, so each build is its own process."""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+import generate_workouts as gw
+
+SCRIPT = os.path.abspath(gw.__file__)
+
+
+def generate(cwd, *args, check=True):
+    command = [sys.executable, SCRIPT, "--jobs", "1", *args]
+    return subprocess.run(command, cwd=cwd, capture_output=True, text=True, check=check)
+
+
+def listing(root):
+    return sorted(os.path.relpath(os.path.join(path, name), root) for path, _, names in os.walk(root) for name in names)
+
+
+def cache_state():
+    try:
+        return os.stat(gw.CATALOG_CACHE_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def test_dry_run_writes_nothing(tmp_path):
+    cached = cache_state()
+    for args in (["--only", "chest"], []):
+        result = generate(tmp_path, "--out", "site", "--dry-run", *args)
+        assert f"Would create {tmp_path / 'site'}" in result.stdout
+        assert "Would rebuild" in result.stdout
+    # Not even an empty --out directory is left behind.
+    assert os.listdir(tmp_path) == []
+    assert cache_state() == cached
+
+    # An existing --out directory is read for its build state, and left as it was.
+    generate(tmp_path, "--out", "site")
+    before = {path: os.path.getmtime(tmp_path / "site" / path) for path in listing(tmp_path / "site")}
+    result = generate(tmp_path, "--out", "site", "--dry-run")
+    assert "Would create" not in result.stdout
+    assert "Would rebuild 0 page(s)" in result.stdout
+    assert {path: os.path.getmtime(tmp_path / "site" / path) for path in listing(tmp_path / "site")} == before
+
+
+def stream_catalog(path, exercises):
+    with open(path, "w", encoding="utf-8") as f:
+        group = {"filename": "big.html", "title": "Big", "intro": [], "default_primary": "P", "default_secondary": "S"}
+        f.write(json.dumps({"group": group}) + "\n")
+        for i in range(exercises):
+            f.write(json.dumps({"name": f"Exercise {i}"}) + "\n")
+
+
+def test_stream_and_spec_builds_share_a_deploy_target(tmp_path):
+    stream_catalog(tmp_path / "big.jsonl", 300)
+    generate(tmp_path, "--out", "site", "--sync-to", "remote")
+    pages = listing(tmp_path / "remote")
+    assert "chest.html" in pages
+
+    # A stream build into the same directory adds its pages without deleting the spec-built ones.
+    result = generate(tmp_path, "--out", "site", "--stream", "big.jsonl", "--sync-to", "remote")
+    assert "0 removed" in result.stdout
+    assert set(pages) < set(listing(tmp_path / "remote"))
+    assert {"big.html", "big-2.html"} <= set(listing(tmp_path / "remote"))
+
+    # Pages the stream no longer produces are still removed.
+    stream_catalog(tmp_path / "big.jsonl", 150)
+    result = generate(tmp_path, "--out", "site", "--stream", "big.jsonl", "--sync-to", "remote")
+    assert "1 removed" in result.stdout
+    assert "big-2.html" not in listing(tmp_path / "remote")
+    assert "chest.html" in listing(tmp_path / "remote")
+
+
+def test_deploy_manifest_holds_only_owned_files_and_their_gzip(tmp_path):
+    # An in-place build directory also holds hand-maintained assets, which --gzip compresses too.
+    (tmp_path / "site" / "js").mkdir(parents=True)
+    shutil.copy(os.path.join(gw.SITE_DIR, "js", "main.js"), tmp_path / "site" / "js" / "main.js")
+    generate(tmp_path, "--out", "site", "--gzip", "--fingerprint")
+    assert (tmp_path / "site" / "js" / "main.js.gz").exists()
+    with open(tmp_path / "site" / gw.DEPLOY_MANIFEST_FILE, encoding="utf-8") as f:
+        files = set(json.load(f)["files"])
+    assert {"chest.html", "chest.html.gz", gw.EXERCISE_CARDS_SCRIPT, gw.EXERCISE_CARDS_SCRIPT + ".gz"} <= files
+    # Every precompressed file ships with its source.
+    assert all(path[: -len(".gz")] in files for path in files if path.endswith(".gz"))
+
+
+@pytest.mark.parametrize(
+    "budgets, message",
+    [
+        ('[pages.chest]\ncards = "x"\n', "pages.chest.cards must be a non-negative integer"),
+        ("[default]\ncards = true\n", "default.cards must be a non-negative integer"),
+        ("[pages.chset]\ncards = 10\n", "unknown page id(s) chset"),
+        ("[default]\nsize = 10\n", "unknown budget metric default.size"),
+        ("cards = 10\n", "unexpected key(s) cards"),
+    ],
+)
+def test_bad_budget_file_is_rejected_before_building(tmp_path, budgets, message):
+    (tmp_path / "budgets.toml").write_text(budgets, encoding="utf-8")
+    result = generate(tmp_path, "--out", "site", "--budget-file", "budgets.toml", check=False)
+    assert result.returncode == 2
+    assert message in result.stderr
+    assert not (tmp_path / "site" / "chest.html").exists()
+
+
+def test_budget_failure_names_the_page(tmp_path):
+    (tmp_path / "budgets.toml").write_text("[pages.chest]\ncards = 10\n", encoding="utf-8")
+    result = generate(tmp_path, "--out", "site", "--budget-file", "budgets.toml", check=False)
+    assert result.returncode == 1
+    assert "Page budget exceeded by chest.html" in result.stderr
+    assert "cause: Chest Training is the largest section" in result.stdout
+
+
+def test_budget_cause_survives_repeated_failing_builds(tmp_path):
+    # A private copy of the generator, so the catalog can be edited.
+    source = tmp_path / "src"
+    source.mkdir()
+    shutil.copy(SCRIPT, source)
+    shutil.copy(gw.CATALOG_FILE, source)
+    (tmp_path / "budgets.toml").write_text("[pages.legs]\ncards = 26\n", encoding="utf-8")
+    command = [sys.executable, str(source / os.path.basename(SCRIPT)), "--jobs", "1", "--out", "site"]
+    subprocess.run([*command, "--budget-file", "budgets.toml"], cwd=tmp_path, check=True, capture_output=True)
+
+    catalog = source / os.path.basename(gw.CATALOG_FILE)
+    text = catalog.read_text(encoding="utf-8")
+    catalog.write_text(text.replace('  "Glute Bridge",\n', '  "Glute Bridge",\n  "Cable Kickback",\n'), encoding="utf-8")
+    for _ in range(2):
+        result = subprocess.run(
+            [*command, "--budget-file", "budgets.toml"], cwd=tmp_path, capture_output=True, text=True
+        )
+        assert result.returncode == 1
+        assert "cause: Glutes grew by +1 card(s)" in result.stdout
+
+
+GROUP = {"filename": "x.html", "title": "T", "default_primary": "P", "default_secondary": "S"}
+
+
+@pytest.mark.parametrize(
+    "lines, message",
+    [
+        ([{"group": dict(GROUP, filename="sub/x.html")}], "stream.jsonl:1: group filename must be a plain .html"),
+        ([{"group": {"filename": "x.html", "title": "T"}}], "stream.jsonl:1: group needs string field(s) default_primary"),
+        ([{"name": "Orphan Curl"}], "stream.jsonl:1: exercise record before any group"),
+        ([{"group": GROUP}, {"name": "Row"}, {"title": "no name"}], 'stream.jsonl:3: exercise needs a string "name"'),
+    ],
+)
+def test_bad_stream_records_name_their_line(tmp_path, lines, message):
+    with open(tmp_path / "stream.jsonl", "w", encoding="utf-8") as f:
+        f.writelines(json.dumps(line) + "\n" for line in lines)
+    result = generate(tmp_path, "--out", "site", "--stream", "stream.jsonl", check=False)
+    assert result.returncode == 1
+    assert message in result.stderr
+    assert "Traceback" not in result.stderr
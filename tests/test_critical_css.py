@@ -0,0 +1,33 @@
+"""Inlined critical CSS must keep pointing at the same files once it moves into a root-level page."""
+
+import generate_workouts as gw
+
+STYLESHEET = """
+.hero { background: url("../images/hero.jpg") center/cover no-repeat; }
+.icon { background: url(icons/check.svg), url('/images/root.png'), url(data:image/png;base64,AAAA); }
+.remote { background: url(https://cdn.example.com/a.png); }
+.unused { background: url("../images/unused.jpg"); }
+@font-face { font-family: Site; src: url("../fonts/site.woff2") format("woff2"); }
+"""
+
+
+def test_relative_urls_are_rebased_from_the_stylesheet_directory():
+    html = '<div class="hero icon remote"></div>'
+    css, count = gw.critical_css(html, gw.parse_stylesheet(STYLESHEET), "assets/css")
+    assert count == 4
+    assert 'url("assets/images/hero.jpg")' in css
+    assert "url(assets/css/icons/check.svg)" in css
+    assert 'src:url("assets/fonts/site.woff2")' in css
+    # Absolute, root-relative and data URLs are left alone.
+    assert "url('/images/root.png')" in css
+    assert "url(data:image/png;base64,AAAA)" in css
+    assert "url(https://cdn.example.com/a.png)" in css
+    assert "unused" not in css
+
+
+def test_site_stylesheet_hero_rule_is_rebased():
+    with open(f"{gw.SITE_DIR}/{gw.CRITICAL_CSS_SOURCE}", encoding="utf-8") as f:
+        rules = gw.parse_stylesheet(f.read())
+    css, _ = gw.critical_css('<section class="hero"></section>', rules, "assets/css")
+    assert 'url("assets/images/hero.jpg")' in css
+    assert "../images" not in css
@@ -0,0 +1,77 @@
+"""EquipmentMatcher must infer exactly what the original if-chain did."""
+
+import itertools
+
+import generate_workouts as gw
+
+
+def original_equip_infer(name: str) -> str:
+    # The if-chain the rule table replaced, kept verbatim as the reference.
+    n = name.lower()
+    if "smith" in n:
+        return "Smith machine"
+    if "barbell" in n:
+        return "Barbell"
+    if "dumbbell" in n:
+        return "Dumbbells"
+    if "machine" in n or "pec-deck" in n or "hack squat" in n:
+        return "Machine"
+    if "cable" in n or "pulldown" in n:
+        return "Cable machine"
+    if "band" in n:
+        return "Bands"
+    if "trx" in n or "suspension" in n:
+        return "Suspension trainer (TRX)"
+    if "press-down" in n:
+        return "Cable machine"
+    if "plate" in n:
+        return "Weight plate"
+    if "farmer" in n:
+        return "Farmer's handles / dumbbells"
+    if "walk" in n or "plank" in n or "push-up" in n or "crunch" in n or "mountain climber" in n or "bridge" in n:
+        return "Bodyweight"
+    if "wheel" in n:
+        return "Ab wheel"
+    if "trap bar" in n:
+        return "Trap bar"
+    return "Bodyweight or listed equipment"
+
+
+KEYWORDS = [keyword for keywords, _ in gw.EQUIPMENT_RULES for keyword in keywords]
+
+
+def synthetic_names():
+    # Every keyword alone, in upper case, and every ordered pair, so rule priority is exercised.
+    yield ""
+    yield "Goblet Squat"
+    for keyword in KEYWORDS:
+        yield f"Seated {keyword} Row"
+        yield keyword.upper()
+    for first, second in itertools.permutations(KEYWORDS, 2):
+        yield f"{first} {second}"
+
+
+def catalog_names():
+    for spec in gw.page_specs():
+        for name, *_ in gw.iter_exercises(spec):
+            yield name
+
+
+def test_matches_if_chain_on_synthetic_names():
+    matcher = gw.EquipmentMatcher(gw.EQUIPMENT_RULES)
+    for name in synthetic_names():
+        assert matcher.infer(name) == original_equip_infer(name), name
+
+
+def test_matches_if_chain_on_catalog():
+    names = list(catalog_names())
+    assert names
+    for name in names:
+        assert gw.equip_infer(name) == original_equip_infer(name), name
+
+
+def test_cached_results_match_uncached():
+    matcher = gw.EquipmentMatcher(gw.EQUIPMENT_RULES, cache_size=2)
+    names = list(synthetic_names())[:50]
+    for name in names + names:
+        assert matcher.infer(name) == original_equip_infer(name)
@@ -0,0 +1,24 @@
+"""The delegated exercise-card script must behave like the per-card listeners it replaced."""
+
+import os
+import shutil
+import subprocess
+
+import pytest
+
+import generate_workouts as gw
+
+JS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "js")
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node")
+def test_matches_previous_script_in_stub_dom(tmp_path):
+    script = tmp_path / "exercise-cards.js"
+    script.write_text(gw.EXERCISE_CARDS_JS, encoding="utf-8")
+    before = os.path.join(JS_DIR, "fixtures", "exercise-cards.before.js")
+    result = subprocess.run(
+        ["node", os.path.join(JS_DIR, "card_parity.js"), before, str(script)],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
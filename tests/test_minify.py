@@ -0,0 +1,92 @@
+"""minify_html() must not change what a page parses to, apart from whitespace that never renders."""
+
+from html.parser import HTMLParser
+
+import pytest
+
+import generate_workouts as gw
+
+RAW_TEXT_TAGS = {"pre", "textarea", "script", "style"}
+
+
+class PageEvents(HTMLParser):
+    """Tags, attributes, comments and text of a document; text outside raw blocks is whitespace-normalised."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.events = []
+        self.raw_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        self.events.append(("start", tag, tuple(attrs)))
+        if tag in RAW_TEXT_TAGS:
+            self.raw_depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self.events.append(("start", tag, tuple(attrs)))
+
+    def handle_endtag(self, tag):
+        self.events.append(("end", tag))
+        if tag in RAW_TEXT_TAGS:
+            self.raw_depth -= 1
+
+    def handle_data(self, data):
+        if self.raw_depth:
+            self.events.append(("raw", data))
+        elif data.split():
+            self.events.append(("text", " ".join(data.split())))
+
+    def handle_comment(self, data):
+        self.events.append(("comment", data))
+
+    def handle_decl(self, decl):
+        self.events.append(("decl", decl))
+
+
+def parse(html: str) -> list:
+    parser = PageEvents()
+    parser.feed(html)
+    parser.close()
+    return parser.events
+
+
+def without_plain_comments(events: list) -> list:
+    return [event for event in events if event[0] != "comment" or event[1].startswith("[if")]
+
+
+@pytest.mark.parametrize("spec", gw.page_specs(), ids=gw.page_id)
+def test_generated_pages_parse_the_same(spec):
+    html = gw.render_spec(spec)
+    minified = gw.minify_html(html)
+    assert len(minified) < len(html)
+    assert parse(minified) == without_plain_comments(parse(html))
+
+
+@pytest.mark.parametrize(
+    "block",
+    [
+        "<pre>  two  spaces\n\n  and lines\t</pre>",
+        "<textarea name=\"notes\">\n  keep   this\n</textarea>",
+        "<script>\n  if (a  <  b) { /* <!-- not a comment --> */ }\n</script>",
+        "<style>\n  .a  >  .b { color : red }\n</style>",
+    ],
+)
+def test_raw_text_blocks_are_kept_verbatim(block):
+    html = f"<body>\n  <p>before   text</p>\n  {block}\n  <p>after</p>\n</body>\n"
+    minified = gw.minify_html(html)
+    assert block in minified
+    assert parse(minified) == parse(html)
+
+
+def test_conditional_comments_are_kept_and_others_dropped():
+    conditional = "<!--[if lt IE 9]><script src=\"html5shiv.js\"></script><![endif]-->"
+    html = f"<head>\n  {conditional}\n  <!-- build note -->\n  <title>T</title>\n</head>\n"
+    minified = gw.minify_html(html)
+    assert conditional in minified
+    assert "build note" not in minified
+    assert parse(minified) == without_plain_comments(parse(html))
+
+
+def test_inline_whitespace_collapses_to_one_space():
+    html = "<p>Primary:\n   <strong>Chest</strong>   and\t<em>triceps</em></p>\n"
+    assert gw.minify_html(html) == "<p>Primary: <strong>Chest</strong> and <em>triceps</em></p>\n"
@@ -0,0 +1,69 @@
+"""Content negotiation and conditional requests in serve_workouts.RenderApp."""
+
+import pytest
+
+import serve_workouts
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip", True),
+        ("br, gzip;q=0.5", True),
+        ("*", True),
+        ("gzip;q=0", False),
+        ("gzip;q=abc", False),
+        ("*, gzip;q=0", False),
+        ("gzip;q=0, *", False),
+        ("*;q=0, gzip", True),
+        ("gzip, *;q=0", True),
+        ("br;q=1, *;q=0.1", True),
+        ("gzip;level=9;q=0", False),
+        ("identity", False),
+        ("", False),
+    ],
+)
+def test_accepts_gzip(header, expected):
+    assert serve_workouts.accepts_gzip(header) is expected
+
+
+def request(app, path="/chest.html", **environ):
+    response = {}
+
+    def start_response(status, headers):
+        response["status"] = status
+        response["headers"] = dict(headers)
+
+    body = b"".join(app({"REQUEST_METHOD": "GET", "PATH_INFO": path, **environ}, start_response))
+    return response["status"], response["headers"], body
+
+
+def test_malformed_quality_is_served_uncompressed():
+    status, headers, _ = request(serve_workouts.RenderApp(), HTTP_ACCEPT_ENCODING="gzip;q=abc")
+    assert status == "200 OK"
+    assert "Content-Encoding" not in headers
+
+
+def test_strong_and_weak_validators_get_304():
+    app = serve_workouts.RenderApp()
+    _, headers, _ = request(app)
+    etag = headers["ETag"]
+    for validator in (etag, f"W/{etag}", f'"other", W/{etag}', "*"):
+        status, _, body = request(app, HTTP_IF_NONE_MATCH=validator)
+        assert (status, body) == ("304 Not Modified", b""), validator
+    status, _, _ = request(app, HTTP_IF_NONE_MATCH='W/"other"')
+    assert status == "200 OK"
+
+
+def test_validator_of_the_other_encoding_gets_the_full_body():
+    app = serve_workouts.RenderApp()
+    _, identity, _ = request(app)
+    _, gzipped, _ = request(app, HTTP_ACCEPT_ENCODING="gzip")
+    assert identity["ETag"] != gzipped["ETag"]
+
+    status, headers, body = request(app, HTTP_IF_NONE_MATCH=gzipped["ETag"])
+    assert status == "200 OK" and body and headers["ETag"] == identity["ETag"]
+    status, headers, body = request(app, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=identity["ETag"])
+    assert status == "200 OK" and body and headers["Content-Encoding"] == "gzip"
+    status, _, _ = request(app, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=gzipped["ETag"])
+    assert status == "304 Not Modified"